@@ -149,7 +149,8 @@ class FileOperations:
             print(f"❌ Error: File already exists: {filepath}")
             return False
         
-        # Get approval
+        # Get approval (slice only when the preview is actually truncated)
+        preview = content if len(content) <= 500 else content[:500] + "..."
         details = f"""
 📝 Create new file: {filepath}
 Lines: {len(content.split(chr(10)))}
@@ -157,7 +158,7 @@ Size: {len(content)} characters
 
 Preview:
 {'-'*60}
-{content[:500]}{'...' if len(content) > 500 else ''}
+{preview}
 {'-'*60}
 """
         
@@ -415,7 +415,8 @@ def propose_file_create(filepath: str, content: str) -> str:
         if path.exists():
             return f"❌ Error: File already exists: {filepath}"
         
-        # Return proposal
+        # Return proposal (slice only when the preview is actually truncated)
+        preview = content if len(content) <= 500 else content[:500] + "..."
         return f"""
 📝 PROPOSE: Create new file
 
@@ -425,7 +426,7 @@ Size: {len(content)} characters
 
 Preview:
 {'-'*60}
-{content[:500]}{'...' if len(content) > 500 else ''}
+{preview}
 {'-'*60}
 
 ⚠️  This action requires user approval.
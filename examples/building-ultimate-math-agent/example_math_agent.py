@@ -6,12 +6,16 @@ This file shows the complete structure of your custom math agent.
 This is what you'll build in your own project!
 """
 
+import math
+from functools import lru_cache, reduce
+from itertools import chain, compress
+from typing import Callable, List, Optional, Tuple
+
 from src.base import Agent
 from src.tools import get_math_tools
 from src.protocol import register_agent, AgentStatus
 from src.commands import create_math_commands
 from src.toolbox import get_toolbox
-from src.tool_generator import generate_tool
 
 # In your real project, you'd import from your custom_tools/ directory:
 # from custom_tools.calculus import get_calculus_tools
@@ -22,6 +26,17 @@ from src.tool_generator import generate_tool
 from langchain_core.tools import tool
 
 
+# The framework tool list and math commands are the same for every agent
+# instance, so build them once per process and hand out copies.
+_cached_math_tools = lru_cache(maxsize=1)(get_math_tools)
+_cached_math_commands = lru_cache(maxsize=1)(create_math_commands)
+
+
+def _lcm(a: int, b: int) -> int:
+    """Least common multiple of two integers."""
+    return abs(a * b) // math.gcd(a, b)
+
+
 # Example: A few custom tools you might add
 @tool
 def polynomial_roots(coefficients: str) -> str:
@@ -66,18 +81,13 @@ def gcd_lcm(numbers: str) -> str:
         The GCD and LCM of the numbers
     """
     try:
-        import math
-        from functools import reduce
-        
         nums = [int(n.strip()) for n in numbers.split(',')]
         
         # Calculate GCD
         gcd_result = reduce(math.gcd, nums)
         
         # Calculate LCM
-        def lcm(a, b):
-            return abs(a * b) // math.gcd(a, b)
-        lcm_result = reduce(lcm, nums)
+        lcm_result = reduce(_lcm, nums)
         
         return f"Numbers: {nums} | GCD: {gcd_result} | LCM: {lcm_result}"
     except Exception as e:
@@ -99,30 +109,64 @@ def prime_factorization(number: int) -> str:
         if number < 2:
             return f"{number} is not factorizable (must be >= 2)"
         
-        n = abs(number)
-        factors = {}
-        d = 2
-        
-        while d * d <= n:
-            while n % d == 0:
-                factors[d] = factors.get(d, 0) + 1
-                n //= d
-            d += 1
-        
-        if n > 1:
-            factors[n] = factors.get(n, 0) + 1
-        
         # Format output
         factor_str = ' × '.join(
             f"{p}^{e}" if e > 1 else str(p)
-            for p, e in sorted(factors.items())
+            for p, e in _factorize(number)
         )
         
-        return f"{abs(number)} = {factor_str}"
+        return f"{number} = {factor_str}"
     except Exception as e:
         return f"Error factorizing: {str(e)}"
 
 
+_SIEVE_LIMIT = 1_000_000
+
+
+@lru_cache(maxsize=1)
+def _small_primes() -> Tuple[int, ...]:
+    """Primes below _SIEVE_LIMIT via a sieve of Eratosthenes, built on first use."""
+    sieve = bytearray([1]) * _SIEVE_LIMIT
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(_SIEVE_LIMIT - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, _SIEVE_LIMIT, i)))
+    return tuple(compress(range(_SIEVE_LIMIT), sieve))
+
+
+@lru_cache(maxsize=4096)
+def _factorize(n: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    Factorize n >= 2 into sorted (prime, exponent) pairs.
+    
+    Cached because agents tend to revisit the same numbers within a
+    conversation; repeat lookups skip the trial division entirely.
+    """
+    factors = {}
+    primes = _small_primes()
+    
+    # Trial-divide by precomputed primes only
+    for p in primes:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    else:
+        # n > _SIEVE_LIMIT**2 may still have factors past the sieve
+        d = primes[-1] + 2
+        while d * d <= n:
+            while n % d == 0:
+                factors[d] = factors.get(d, 0) + 1
+                n //= d
+            d += 2
+    
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    
+    return tuple(sorted(factors.items()))
+
+
 # Register your agent with the protocol system
 @register_agent(
     name="ultimate_math",
@@ -155,6 +199,8 @@ class UltimateMathAgent(Agent):
     def __init__(self, 
                  enable_memory: bool = True,
                  memory_session_id: str = "math_session",
+                 extra_tools: Optional[List[Callable]] = None,
+                 system_prompt_suffix: str = "",
                  **kwargs):
         """
         Initialize the Ultimate Math Agent.
@@ -162,9 +208,32 @@ class UltimateMathAgent(Agent):
         Args:
             enable_memory: Enable conversation memory (default: True)
             memory_session_id: Session ID for memory persistence
+            extra_tools: Additional tools for subclasses, included in the first build
+            system_prompt_suffix: Text appended to the system prompt (for subclasses)
             **kwargs: Additional arguments passed to base Agent
         """
         
+        print("🔧 Initializing Ultimate Math Agent...")
+        
+        # Compose every tool before the base class builds the agent chain, so
+        # it is built once instead of once per add_tools() call
+        print("  📦 Adding framework math tools...")
+        
+        print("  🎯 Adding custom tools...")
+        custom_tools = [
+            polynomial_roots,
+            gcd_lcm,
+            prime_factorization,
+            # In your real project, you'd add:
+            # *get_calculus_tools(),
+            # *get_statistics_tools(),
+            # *get_linear_algebra_tools(),
+        ]
+        
+        # One allocation for the final list instead of copies plus concatenations
+        tools = list(chain(_cached_math_tools(), custom_tools, extra_tools or ()))
+        initial_tool_count = len(tools)
+        
         # Initialize with enhanced system prompt
         super().__init__(
             system_prompt="""I am the Ultimate Math Agent, your specialized mathematical assistant.
@@ -184,42 +253,23 @@ My Approach:
 4. I remember our conversation history for contextual assistance
 5. I can handle both numerical and symbolic mathematics
 
-I use precise mathematical notation and provide accurate, verified results.""",
+I use precise mathematical notation and provide accurate, verified results.""" + system_prompt_suffix,
+            tools=tools,
             enable_memory=enable_memory,
             memory_session_id=memory_session_id,
             enable_commands=True,
             **kwargs
         )
         
-        print("🔧 Initializing Ultimate Math Agent...")
-        
-        # Add built-in math tools from the framework
-        print("  📦 Adding framework math tools...")
-        self.add_tools(get_math_tools())
-        
-        # Add your custom tools
-        print("  🎯 Adding custom tools...")
-        custom_tools = [
-            polynomial_roots,
-            gcd_lcm,
-            prime_factorization,
-            # In your real project, you'd add:
-            # *get_calculus_tools(),
-            # *get_statistics_tools(),
-            # *get_linear_algebra_tools(),
-        ]
-        self.add_tools(custom_tools)
-        
         # Add math commands for fast operations
         print("  ⚡ Adding command shortcuts...")
-        for cmd in create_math_commands():
-            self.add_command(cmd)
+        self.add_commands(list(_cached_math_commands()))
         
         # Load any additional tools from toolbox
         print("  🧰 Loading tools from toolbox...")
         try:
             self.load_tools_from_toolbox(category="math")
-            print(f"     Loaded {len(self.list_tools()) - len(custom_tools) - len(get_math_tools())} additional tools from toolbox")
+            print(f"     Loaded {len(self.list_tools()) - initial_tool_count} additional tools from toolbox")
         except Exception as e:
             print(f"     Toolbox loading skipped: {e}")
         
@@ -263,14 +313,15 @@ def create_ultimate_math_agent(
 
 
 # Example usage and demonstrations
-def demonstrate_agent():
+def demonstrate_agent(agent: Optional[UltimateMathAgent] = None):
     """Demonstrate the capabilities of the Ultimate Math Agent."""
     
     print("🧪 Ultimate Math Agent Demonstration")
     print("=" * 70)
     
-    # Create agent
-    agent = create_ultimate_math_agent(session_id="demo_session")
+    # Create agent unless the caller shares one
+    if agent is None:
+        agent = create_ultimate_math_agent(session_id="demo_session")
     
     # Test queries covering different capabilities
     test_queries = [
@@ -319,13 +370,14 @@ def demonstrate_agent():
     print("   • Conversation memory across queries")
 
 
-def demonstrate_commands():
+def demonstrate_commands(agent: Optional[UltimateMathAgent] = None):
     """Demonstrate the command system for fast operations."""
     
     print("\n⚡ Command System Demonstration")
     print("=" * 70)
     
-    agent = create_ultimate_math_agent()
+    if agent is None:
+        agent = create_ultimate_math_agent()
     
     print("\n💬 Using chat (slower - goes through LLM):")
     print("   Query: 'Calculate 15 * 23'")
@@ -350,13 +402,14 @@ def demonstrate_commands():
     print("   • When you know exactly which tool to use")
 
 
-def demonstrate_toolbox():
+def demonstrate_toolbox(agent: Optional[UltimateMathAgent] = None):
     """Demonstrate dynamic tool generation with the toolbox system."""
     
     print("\n🧰 Toolbox System Demonstration")
     print("=" * 70)
     
-    agent = create_ultimate_math_agent()
+    if agent is None:
+        agent = create_ultimate_math_agent()
     
     print("\n1️⃣ Generating a new tool dynamically...")
     print("   Description: 'Calculate the Fibonacci sequence up to n terms'")
@@ -385,8 +438,12 @@ def demonstrate_toolbox():
         toolbox = get_toolbox()
         tools = toolbox.list_tools(category="math")
         print(f"   📦 Toolbox contains {len(tools)} math tools:")
-        for tool_info in tools[:5]:
-            print(f"      • {tool_info['name']} - {tool_info['description'][:50]}...")
+        if tools:
+            # One write for the whole listing instead of a print per tool
+            print("\n".join(
+                f"      • {tool_info['name']} - {tool_info['description'][:50]}..."
+                for tool_info in tools[:5]
+            ))
     except Exception as e:
         print(f"   ⚠️  Toolbox access: {e}")
     
@@ -403,10 +460,11 @@ if __name__ == "__main__":
     import sys
     
     if len(sys.argv) > 1 and sys.argv[1] == "demo":
-        # Run demonstrations
-        demonstrate_agent()
-        demonstrate_commands()
-        demonstrate_toolbox()
+        # Run demonstrations, sharing one agent instead of building three
+        demo_agent = create_ultimate_math_agent(session_id="demo_session")
+        demonstrate_agent(demo_agent)
+        demonstrate_commands(demo_agent)
+        demonstrate_toolbox(demo_agent)
     else:
         # Interactive mode
         print("🤖 Ultimate Math Agent - Interactive Mode")
@@ -446,7 +504,7 @@ if __name__ == "__main__":
                     continue
                 
                 if user_input.lower() == 'toolbox':
-                    demonstrate_toolbox()
+                    demonstrate_toolbox(agent)
                     continue
                 
                 if user_input.lower().startswith('generate '):
@@ -462,9 +520,11 @@ if __name__ == "__main__":
                         print("⚠️  Please provide a description: generate <description>")
                     continue
                 
-                # Process query
-                response = agent.chat(user_input)
-                print(f"\n🤖 Agent: {response}")
+                # Process query, printing tokens as they arrive
+                print("\n🤖 Agent: ", end="", flush=True)
+                for chunk in agent.stream_chat(user_input):
+                    print(chunk, end="", flush=True)
+                print()
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Interrupted. Goodbye!")
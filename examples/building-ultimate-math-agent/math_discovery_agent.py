@@ -13,20 +13,33 @@ This agent can become your mathematical research assistant for finding
 and cataloging new mathematical discoveries.
 """
 
-import sys
 import re
+import warnings
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
 
 from src.base import Agent
 from src.tools import get_math_tools
 from src.protocol import register_agent, AgentStatus
 from src.commands import create_math_commands, command
-from src.toolbox import get_toolbox
-from src.tool_generator import generate_tool
 from src.rag import RAGManager
 from langchain_core.tools import tool
-import sympy as sp
+
+# sympy and numpy are imported inside the tool bodies: they cost hundreds of
+# milliseconds to load and are only needed once a discovery tool actually runs.
+
+
+# Layout-only LaTeX commands stripped before parsing, matched in a single pass.
+# The lookbehind keeps "\\" line breaks intact.
+_RE_STRIP = re.compile(r'(?<!\\)\\(?:displaystyle|nolimits|limits|[!,;]|\s)')
+
+
+@lru_cache(maxsize=64)
+def _sym(name: str):
+    """Return the SymPy symbol for a variable name, built once per name."""
+    import sympy as sp
+    return sp.Symbol(name)
 
 
 @tool
@@ -42,8 +55,16 @@ def verify_infinite_series(expression: str, variable: str = "n", limit: int = 10
     Returns:
         Convergence analysis and partial sum
     """
+    return _verify_series_impl(expression.strip(), variable.strip(), limit)
+
+
+@lru_cache(maxsize=2048)
+def _verify_series_impl(expression: str, variable: str, limit: int) -> str:
+    """Cached body of verify_infinite_series (pure function of its arguments)."""
+    import sympy as sp
+    
     try:
-        var = sp.Symbol(variable)
+        var = _sym(variable)
         term = sp.sympify(expression)
         
         # Compute partial sum
@@ -80,8 +101,16 @@ def verify_infinite_product(expression: str, variable: str = "n", limit: int = 1
     Returns:
         Convergence analysis and partial product
     """
+    return _verify_product_impl(expression.strip(), variable.strip(), limit)
+
+
+@lru_cache(maxsize=2048)
+def _verify_product_impl(expression: str, variable: str, limit: int) -> str:
+    """Cached body of verify_infinite_product (pure function of its arguments)."""
+    import sympy as sp
+    
     try:
-        var = sp.Symbol(variable)
+        var = _sym(variable)
         term = sp.sympify(expression)
         
         # Compute partial product
@@ -117,40 +146,61 @@ def discover_series_pattern(sequence: str) -> str:
     Returns:
         Discovered pattern and formula
     """
+    # Normalize whitespace around commas so "1, 4, 9" and "1,4,9" share a
+    # cache entry; spaces between numbers ("1 2 3") are kept and rejected
+    return _discover_impl(re.sub(r"\s*,\s*", ",", sequence.strip()))
+
+
+@lru_cache(maxsize=2048)
+def _discover_impl(sequence: str) -> str:
+    """Cached body of discover_series_pattern (pure function of the sequence)."""
+    import numpy as np
+    import sympy as sp
+    
     try:
-        nums = [float(x.strip()) for x in sequence.split(',')]
-        n = len(nums)
+        # Parse straight into a float64 array in C. Unparseable text only
+        # warns and truncates the array, so make that warning an error.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            nums = np.fromstring(sequence, sep=',', dtype=np.float64)
+        n = nums.size
+        if n == 0:
+            return "Error discovering pattern: sequence contains no numbers"
         
         results = []
         
         # Check polynomial patterns
-        var = sp.Symbol('n')
+        var = _sym('n')
+        xs = np.arange(1, n + 1, dtype=np.float64)
         for degree in range(1, min(5, n)):
             try:
-                # Fit polynomial
-                coeffs = sp.polys.polyfit(list(range(1, n + 1)), nums, degree)
-                poly = sum(c * var**i for i, c in enumerate(reversed(coeffs)))
+                # Fit polynomial numerically (coefficients are highest degree first)
+                coeffs = np.polyfit(xs, nums, degree)
                 
                 # Verify fit
-                predicted = [float(poly.subs(var, i)) for i in range(1, n + 1)]
-                error = sum(abs(p - a) for p, a in zip(predicted, nums)) / n
+                error = float(np.abs(np.polyval(coeffs, xs) - nums).mean())
                 
                 if error < 0.01:
+                    # Build the symbolic form only for an accepted fit; Poly takes
+                    # the same highest-degree-first ordering and builds in one pass
+                    poly = sp.Poly(np.round(coeffs, 10).tolist(), var).as_expr()
                     results.append(f"Polynomial (degree {degree}): a(n) = {poly}")
-            except:
+                    break
+            except Exception:
                 pass
         
-        # Check Fibonacci-like patterns
+        # Check Fibonacci-like patterns (whole-array comparison, no Python loop)
         if n >= 3:
-            is_fib = all(abs(nums[i] - (nums[i-1] + nums[i-2])) < 0.01 
-                        for i in range(2, n))
+            is_fib = bool((np.abs(nums[2:] - nums[1:-1] - nums[:-2]) < 0.01).all())
             if is_fib:
                 results.append("Pattern: Fibonacci-like (a(n) = a(n-1) + a(n-2))")
         
         # Check geometric series
         if n >= 2:
-            ratios = [nums[i] / nums[i-1] for i in range(1, n) if nums[i-1] != 0]
-            if ratios and all(abs(r - ratios[0]) < 0.01 for r in ratios):
+            prev = nums[:-1]
+            nonzero = prev != 0
+            ratios = nums[1:][nonzero] / prev[nonzero]
+            if ratios.size and (np.abs(ratios - ratios[0]) < 0.01).all():
                 results.append(f"Geometric series: a(n) = a(1) * {ratios[0]:.4f}^(n-1)")
         
         if results:
@@ -173,13 +223,15 @@ def parse_latex_formula(latex: str) -> str:
     Returns:
         Parsed components and symbolic representation
     """
+    return _parse_latex_impl(latex.strip())
+
+
+@lru_cache(maxsize=2048)
+def _parse_latex_impl(latex: str) -> str:
+    """Cached body of parse_latex_formula (pure function of the formula)."""
     try:
-        # Clean LaTeX
-        formula = latex.strip()
-        
-        # Remove common LaTeX commands
-        formula = formula.replace(r'\displaystyle', '')
-        formula = formula.replace(r'\limits', '')
+        # Clean LaTeX: remove layout commands in one pass
+        formula = _RE_STRIP.sub('', latex)
         
         result = f"Original LaTeX: {latex}\n\n"
         result += "Parsed components:\n"
@@ -295,6 +347,7 @@ class MathDiscoveryAgent(Agent):
         
         # Initialize RAG for mathematical knowledge
         print("  📚 Initializing knowledge base (RAG)...")
+        self._retriever = None
         try:
             self.rag = RAGManager()
             self.rag_collection = "mathematical_discoveries"
@@ -455,6 +508,7 @@ I am creative yet rigorous in my mathematical exploration."""
                 )
                 vectorstore.add_documents(splits)
                 self.rag.collections[self.rag_collection] = vectorstore
+                self._retriever = None
             
             return f"✅ Added formula to knowledge base:\n{latex}"
             
@@ -515,9 +569,9 @@ I am creative yet rigorous in my mathematical exploration."""
             if self.rag_collection not in self.rag.collections:
                 return "No knowledge base found. Ingest some formulas first."
             
-            # Get retriever and search
-            retriever = self.rag.get_retriever(self.rag_collection)
-            results = retriever.invoke(query)[:k]
+            # Reuse one retriever and let Qdrant return only the top k hits
+            self._retriever = self._retriever or self.rag.get_retriever(self.rag_collection)
+            results = self._retriever.invoke(query, k=k)
             
             if not results:
                 return "No relevant knowledge found."
@@ -18,67 +18,34 @@ This will:
 
 import os
 import sys
-import shutil
+from functools import lru_cache
 from pathlib import Path
 
-def create_project(project_name: str, base_path: Path = None):
-    """Create a new agent project from the framework."""
-    
-    print(f"🚀 Creating project: {project_name}")
-    print("=" * 70)
-    
-    # Determine paths
-    if base_path is None:
-        base_path = Path.cwd()
-    
-    project_path = base_path / project_name
-    framework_path = Path(__file__).parent.parent.parent  # Go up to langchain-agent-base root
-    
-    if project_path.exists():
-        print(f"❌ Error: Directory {project_path} already exists!")
-        return False
-    
-    try:
-        # Step 1: Create directory structure
-        print("\n1️⃣ Creating directory structure...")
-        project_path.mkdir(parents=True)
-        (project_path / "custom_tools").mkdir()
-        (project_path / "agents").mkdir()
-        (project_path / "tests").mkdir()
-        (project_path / "docs").mkdir()
-        print("   ✅ Directories created")
-        
-        # Step 2: Copy framework
-        print("\n2️⃣ Copying framework files...")
-        src_source = framework_path / "src"
-        src_dest = project_path / "src"
-        
-        if src_source.exists():
-            shutil.copytree(src_source, src_dest)
-            print("   ✅ Framework copied to src/")
-        else:
-            print(f"   ⚠️  Warning: Could not find src/ at {src_source}")
-        
-        # Step 3: Copy reference files
-        print("\n3️⃣ Copying reference files...")
-        files_to_copy = [
-            ("pyproject.toml", "pyproject.toml"),
-            (".gitignore", ".gitignore"),
-            ("main.py", "main.py"),
-        ]
-        
-        for source_file, dest_file in files_to_copy:
-            source = framework_path / source_file
-            dest = project_path / dest_file
-            if source.exists():
-                shutil.copy2(source, dest)
-                print(f"   ✅ Copied {source_file}")
-        
-        # Step 4: Create template files
-        print("\n4️⃣ Creating template files...")
-        
-        # custom_tools/__init__.py
-        (project_path / "custom_tools" / "__init__.py").write_text('''"""
+# shutil, subprocess and concurrent.futures are imported where they are used so
+# the usage/validation error paths of the CLI don't pay for them.
+
+# langchain-agent-base root, resolved once at import
+_FRAMEWORK_PATH = Path(__file__).resolve().parent.parent.parent
+
+# Reference files copied from the framework root: (absolute source, project-relative dest)
+_FILES_TO_COPY = tuple(
+    (str(_FRAMEWORK_PATH / source_file), dest_file)
+    for source_file, dest_file in (
+        ("pyproject.toml", "pyproject.toml"),
+        (".gitignore", ".gitignore"),
+        ("main.py", "main.py"),
+    )
+)
+
+# Entries never copied from the framework tree into a new project
+_COPY_IGNORE = frozenset({"__pycache__"})
+
+# Top-level directories of a new project (the root is created fresh, so no exist_ok)
+_SUBDIRS = ("custom_tools", "agents", "tests", "docs")
+
+# Static template files written into every new project, pre-encoded once at import.
+_TEMPLATES = (
+    ("custom_tools/__init__.py", '''"""
 Custom Tools for Your Agent
 """
 
@@ -91,20 +58,16 @@ def get_all_custom_tools():
     return [
         # Add your tools here
     ]
-''')
-        
-        # agents/__init__.py
-        (project_path / "agents" / "__init__.py").write_text('''"""
+'''.encode("utf-8")),
+    ("agents/__init__.py", '''"""
 Your Custom Agents
 """
 
 from agents.math_agent import create_ultimate_math_agent
 
 __all__ = ['create_ultimate_math_agent']
-''')
-        
-        # agents/math_agent.py
-        (project_path / "agents" / "math_agent.py").write_text('''"""
+'''.encode("utf-8")),
+    ("agents/math_agent.py", '''"""
 Your Ultimate Math Agent
 """
 
@@ -142,86 +105,162 @@ class UltimateMathAgent(Agent):
 def create_ultimate_math_agent(**kwargs):
     """Factory function for your agent."""
     return UltimateMathAgent(**kwargs)
-''')
-        
-        # .env.example
-        (project_path / ".env.example").write_text('''# Get your API key from https://console.groq.com/
+'''.encode("utf-8")),
+    (".env.example", '''# Get your API key from https://console.groq.com/
 GROQ_API_KEY=your_groq_api_key_here
 
 # Optional: LangSmith for debugging
 # LANGSMITH_API_KEY=your_langsmith_key
 # LANGSMITH_TRACING=true
-''')
-        
-        # README.md
-        (project_path / "README.md").write_text(f'''# {project_name.replace("-", " ").title()}
-
-Ultimate mathematical AI agent built with LangChain Agent Base.
-
-## Quick Start
-
-```bash
-# Set up environment
-python -m venv .venv
-source .venv/bin/activate  # Windows: .venv\\Scripts\\activate
-
-# Install dependencies
-pip install -e .
-
-# Configure API key
-cp .env.example .env
-# Edit .env and add your GROQ_API_KEY
-
-# Run the agent
-python main.py chat
-```
-
-## Project Structure
-
-- `src/` - LangChain Agent Base framework
-- `custom_tools/` - Your custom mathematical tools
-- `agents/` - Your agent definitions
-- `tests/` - Test files
-- `docs/` - Documentation
-
-## Adding Custom Tools
-
-1. Create a new file in `custom_tools/` (e.g., `calculus.py`)
-2. Write your tool using `@tool` decorator
-3. Import and export in `custom_tools/__init__.py`
-4. Tools automatically available to your agent!
-
-## Development
+'''.encode("utf-8")),
+)
 
-```bash
-# Interactive chat
-python main.py chat --memory
+@lru_cache(maxsize=1)
+def _readme_template() -> str:
+    """Load the README.md skeleton once; ``{name}`` is its only placeholder."""
+    return Path(__file__).with_name("_readme_template.md").read_text(encoding="utf-8")
 
-# Start API server
-python main.py server
 
-# Run tests
-pytest tests/
-```
+def _write_file(path, data: bytes):
+    """Write bytes to a new file with raw os calls (no TextIOWrapper setup)."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _copy_one(pair):
+    """Copy a single file's contents, preferring the in-kernel copy_file_range."""
+    src, dst = pair
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                if remaining == 0:
+                    return
+        except OSError:
+            pass
+    
+    import shutil
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        shutil.copyfileobj(fsrc, fdst, length=256 * 1024)
 
-## Documentation
 
-See the [building-ultimate-math-agent guide](https://github.com/BlueberryMathematician/langchain-agent-base/tree/main/examples/building-ultimate-math-agent) for detailed instructions.
+def _fast_copytree(src, dst, workers: int = 8):
+    """
+    Copy a directory tree using os.scandir and a thread pool.
+    
+    Directories are created up front in a single walk, then file copies
+    (which are dominated by per-file syscalls) are spread across threads.
+    Bytecode caches are skipped; they are rebuilt on first import anyway.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    dirs = [dst]
+    pairs = []
+    stack = [(src, dst)]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                if entry.name in _COPY_IGNORE or entry.name.endswith(".pyc"):
+                    continue
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    dirs.append(target)
+                    stack.append((entry.path, target))
+                elif entry.is_file():
+                    pairs.append((entry.path, target))
+    
+    for directory in dirs:
+        os.makedirs(directory, exist_ok=True)
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the iterator so worker exceptions propagate
+        list(executor.map(_copy_one, pairs))
 
-## License
 
-Apache 2.0
-''')
+def create_project(project_name: str, base_path: Path = None):
+    """Create a new agent project from the framework."""
+    import shutil
+    import subprocess
+    
+    print(f"🚀 Creating project: {project_name}")
+    print("=" * 70)
+    
+    # Determine paths
+    if base_path is None:
+        base_path = Path.cwd()
+    
+    project_path = base_path / project_name
+    
+    # Creating the root doubles as the "already exists" check, with no race window
+    try:
+        project_path.mkdir(parents=True, exist_ok=False)
+    except FileExistsError:
+        print(f"❌ Error: Directory {project_path} already exists!")
+        return False
+    
+    try:
+        # Step 1: Create directory structure
+        print("\n1️⃣ Creating directory structure...")
+        for subdir in _SUBDIRS:
+            os.mkdir(os.path.join(project_path, subdir))
+        print("   ✅ Directories created")
+        
+        # Step 2: Copy framework
+        print("\n2️⃣ Copying framework files...")
+        src_source = _FRAMEWORK_PATH / "src"
+        src_dest = project_path / "src"
+        
+        if src_source.exists():
+            _fast_copytree(src_source, src_dest)
+            print("   ✅ Framework copied to src/")
+        else:
+            print(f"   ⚠️  Warning: Could not find src/ at {src_source}")
+        
+        # Step 3: Copy reference files
+        print("\n3️⃣ Copying reference files...")
+        for source, dest_file in _FILES_TO_COPY:
+            if os.path.isfile(source):
+                # Data only: copyfile can use sendfile/copy_file_range, and
+                # the source timestamps are not wanted in a fresh project
+                shutil.copyfile(source, os.path.join(project_path, dest_file))
+                print(f"   ✅ Copied {dest_file}")
+        
+        # Step 4: Create template files
+        print("\n4️⃣ Creating template files...")
+        
+        for rel_path, body in _TEMPLATES:
+            _write_file(project_path / rel_path, body)
+        
+        readme = _readme_template().format(name=project_name.replace("-", " ").title())
+        _write_file(project_path / "README.md", readme.encode("utf-8"))
         
         print("   ✅ Template files created")
         
         # Step 5: Initialize git
         print("\n5️⃣ Initializing git repository...")
-        os.chdir(project_path)
-        os.system("git init")
-        os.system("git add .")
-        os.system('git commit -m "Initial commit: Project structure from LangChain Agent Base"')
-        print("   ✅ Git repository initialized")
+        if shutil.which("git"):
+            # Run git directly (no shell) in the project dir instead of chdir-ing
+            subprocess.run(["git", "init", "-q"], cwd=project_path, check=False)
+            subprocess.run(["git", "add", "-A"], cwd=project_path, check=False)
+            subprocess.run(
+                ["git", "commit", "-qm", "Initial commit: Project structure from LangChain Agent Base"],
+                cwd=project_path,
+                check=False,
+            )
+            print("   ✅ Git repository initialized")
+        else:
+            print("   ⚠️  git not found, skipping repository initialization")
         
         # Step 6: Success message
         print("\n" + "=" * 70)
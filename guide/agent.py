@@ -1,3 +1,6 @@
+import asyncio
+import functools
+
 from langchain_groq import ChatGroq
 from langchain.agents import create_agent
 # Note: The following import is based on LangChain 1.0 docs. 
@@ -13,7 +16,9 @@ from langgraph.checkpoint.memory import MemorySaver
 from src.tools import get_weather, magic_calculator
 from src.rag import setup_rag_tools
 
+@functools.cache
 def get_model():
+    # One shared client, so every agent built here reuses its HTTP connection pool
     return ChatGroq(model="openai/gpt-oss-120b", temperature=0)
 
 def build_simple_agent():
@@ -79,59 +84,59 @@ async def build_rag_agent():
 async def build_multi_agent_system():
     """
     Demonstrates a simple multi-agent setup.
-    We create a 'Researcher' and a 'Writer' and a 'Supervisor' to manage them.
-    In LangChain 1.0, since agents are graphs, we can use them as tools.
+    We create a 'Researcher' and a 'Writer' and chain them in a small graph.
+    In LangChain 1.0, since agents are graphs, they can be used directly as nodes.
     """
     model = get_model()
     
+    async def load_research_tools():
+        try:
+            return await setup_rag_tools()
+        except Exception:
+            return []
+    
+    # The writer doesn't depend on the RAG tools, so build its graph in a
+    # worker thread while the documents are fetched and indexed
+    rag_tools, writer = await asyncio.gather(
+        load_research_tools(),
+        # 2. Writer Agent
+        asyncio.to_thread(
+            create_agent,
+            model=model,
+            tools=[], # Writer just writes, maybe has some basic tools
+            system_prompt="You are a writer. specific style: Tech Blog. Use facts provided by the user."
+        )
+    )
+    
     # 1. Researcher Agent
-    rag_tools = []
-    try:
-        rag_tools = await setup_rag_tools()
-    except:
-        pass
-        
     researcher = create_agent(
         model=model,
         tools=rag_tools,
         system_prompt="You are a researcher. Search for facts about LangChain 1.0 and report them accurately."
     )
     
-    # 2. Writer Agent
-    writer = create_agent(
-        model=model,
-        tools=[], # Writer just writes, maybe has some basic tools
-        system_prompt="You are a writer. specific style: Tech Blog. Use facts provided by the user."
-    )
-    
-    # To compose them, we can wrap them as tools for a Supervisor
-    # Or use LangGraph's supervisor pattern. 
-    # For simplicity in this 'create_agent' centric demo, we will treat them as tools.
-    
-    from langchain_core.tools import tool
+    # The order is always research -> write, so wire it as fixed graph edges
+    # rather than paying a supervisor LLM to plan the same two steps each time.
+    from langgraph.graph import StateGraph, MessagesState, START, END
 
-    @tool
-    def ask_researcher(query: str) -> str:
-        """Ask the researcher to find information."""
-        result = researcher.invoke({"messages": [{"role": "user", "content": query}]})
-        return result["messages"][-1].content
+    def research(state: MessagesState):
+        """Have the researcher gather facts for the request."""
+        result = researcher.invoke({"messages": state["messages"]})
+        return {"messages": [result["messages"][-1]]}
 
-    @tool
-    def ask_writer(topic: str, content: str) -> str:
-        """Ask the writer to write about a topic using provided content."""
+    def write(state: MessagesState):
+        """Have the writer turn the research into a post."""
+        topic = state["messages"][0].content
+        content = state["messages"][-1].content
         prompt = f"Topic: {topic}\nContent: {content}"
         result = writer.invoke({"messages": [{"role": "user", "content": prompt}]})
-        return result["messages"][-1].content
+        return {"messages": [result["messages"][-1]]}
 
-    supervisor_tools = [ask_researcher, ask_writer]
-    
-    supervisor = create_agent(
-        model=model,
-        tools=supervisor_tools,
-        system_prompt="""You are a supervisor. 
-        1. Ask the researcher for info. 
-        2. Then ask the writer to write a post based on that info.
-        """
-    )
+    graph = StateGraph(MessagesState)
+    graph.add_node("research", research)
+    graph.add_node("write", write)
+    graph.add_edge(START, "research")
+    graph.add_edge("research", "write")
+    graph.add_edge("write", END)
     
-    return supervisor
+    return graph.compile()
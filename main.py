@@ -10,26 +10,114 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-try:
-    from src.server import run_protocol_server
-    SERVER_AVAILABLE = True
-except ImportError:
-    print("⚠️  FastAPI not installed. Server functionality disabled.")
-    SERVER_AVAILABLE = False
-
-try:
-    from src.discovery import auto_discover_all, start_protocol_watcher
-    DISCOVERY_AVAILABLE = True
-except ImportError:
-    print("⚠️  Discovery dependencies not available.")
-    DISCOVERY_AVAILABLE = False
-
-try:
-    from examples.math_agent_evolution import demonstrate_math_agent_evolution
-    EXAMPLES_AVAILABLE = True
-except ImportError:
-    print("⚠️  Example dependencies not available.")
-    EXAMPLES_AVAILABLE = False
+# Subcommand dependencies (FastAPI, discovery, examples) are imported inside
+# the handler that needs them, so `--help` and unrelated commands stay fast.
+
+# Discovery manifest, kept in the project root whatever the working directory
+DISCOVERY_CACHE_PATH = str(Path(__file__).parent / ".discovery_cache.json")
+
+
+def _run_server(args):
+    """Start the protocol server after auto-discovering agents and tools."""
+    print(f"🚀 Starting LangChain Agent Base Protocol Server")
+    print(f"📍 Host: {args.host}:{args.port}")
+    print(f"📚 Documentation: http://{args.host}:{args.port}/docs")
+    
+    try:
+        from src.server import run_protocol_server
+        from src.discovery import auto_discover_all
+        server_available = True
+    except ImportError:
+        server_available = False
+    
+    if server_available:
+        # Auto-discover agents before starting server
+        print("🔍 Auto-discovering agents and tools...")
+        auto_discover_all(cache_path=DISCOVERY_CACHE_PATH)
+        
+        # Start server
+        run_protocol_server(
+            host=args.host,
+            port=args.port,
+            reload=args.reload
+        )
+    else:
+        print("❌ Server dependencies not available.")
+        print("💡 Install with: pip install fastapi uvicorn qdrant-client langchain")
+
+
+def _run_discover(args):
+    """Discover agents, tools and commands and print a summary."""
+    try:
+        from src.discovery import auto_discover_all
+    except ImportError:
+        print("⚠️  Discovery dependencies not available.")
+        print("❌ Discovery not available. Install dependencies: pip install -e .")
+        return
+    
+    print("🔍 Running agent and tool discovery...")
+    results = auto_discover_all(watch_directories=args.directories, cache_path=DISCOVERY_CACHE_PATH)
+    
+    print(f"\n✅ Discovery Results:")
+    print(f"   📋 Tools discovered: {len(results['tools'])}")
+    print(f"   ⚡ Commands discovered: {len(results['commands'])}")
+    print(f"   🤖 Agents discovered: {len(results['agents'])}")
+    
+    if results['tools']:
+        print(f"\n📋 Tools by category:")
+        from collections import defaultdict
+        tools_by_category = defaultdict(list)
+        for tool in results['tools']:
+            tools_by_category[tool.category].append(tool.name)
+        
+        for category, tool_names in tools_by_category.items():
+            print(f"   {category}: {', '.join(tool_names)}")
+
+
+def _run_demo(args):
+    """Run the math agent evolution demonstration."""
+    try:
+        from examples.math_agent_evolution import demonstrate_math_agent_evolution
+        examples_available = True
+    except ImportError:
+        print("⚠️  Example dependencies not available.")
+        examples_available = False
+    
+    if examples_available:
+        print("🎭 Running Math Agent Evolution Demonstration")
+        demonstrate_math_agent_evolution()
+    else:
+        print("❌ Demo not available. Install dependencies: pip install -e .")
+
+
+def _run_watch(args):
+    """Watch directories for new agents until interrupted."""
+    try:
+        from src.discovery import start_protocol_watcher
+        discovery_available = True
+    except ImportError:
+        print("⚠️  Discovery dependencies not available.")
+        discovery_available = False
+    
+    if discovery_available:
+        print(f"👀 Starting protocol watcher for directories: {args.directories}")
+        print(f"⏱️  Scan interval: {args.interval} seconds")
+        
+        # Start file system watcher
+        start_protocol_watcher(
+            watch_directories=args.directories,
+            scan_interval=args.interval
+        )
+    else:
+        print("❌ Watch not available. Install dependencies: pip install -e .")
+    
+    # Keep running
+    try:
+        import time
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\n👋 Protocol watcher stopped")
 
 
 def main():
@@ -54,94 +142,32 @@ Examples:
     server_parser.add_argument('--host', default='0.0.0.0', help='Server host (default: 0.0.0.0)')
     server_parser.add_argument('--port', type=int, default=8000, help='Server port (default: 8000)')
     server_parser.add_argument('--reload', action='store_true', help='Enable auto-reload for development')
+    server_parser.set_defaults(func=_run_server)
     
     # Discovery command
     discovery_parser = subparsers.add_parser('discover', help='Auto-discover agents and tools')
     discovery_parser.add_argument('--directories', nargs='*', help='Directories to scan for agents')
+    discovery_parser.set_defaults(func=_run_discover)
     
     # Demo command
     demo_parser = subparsers.add_parser('demo', help='Run math agent demonstration')
+    demo_parser.set_defaults(func=_run_demo)
     
     # Watch command
     watch_parser = subparsers.add_parser('watch', help='Watch directories for new agents')
     watch_parser.add_argument('directories', nargs='+', help='Directories to watch')
     watch_parser.add_argument('--interval', type=int, default=30, help='Scan interval in seconds')
+    watch_parser.set_defaults(func=_run_watch)
     
     args = parser.parse_args()
     
-    if args.command == 'server':
-        print(f"🚀 Starting LangChain Agent Base Protocol Server")
-        print(f"📍 Host: {args.host}:{args.port}")
-        print(f"📚 Documentation: http://{args.host}:{args.port}/docs")
-        
-        if SERVER_AVAILABLE and DISCOVERY_AVAILABLE:
-            # Auto-discover agents before starting server
-            print("🔍 Auto-discovering agents and tools...")
-            auto_discover_all()
-            
-            # Start server
-            run_protocol_server(
-                host=args.host,
-                port=args.port,
-                reload=args.reload
-            )
-        else:
-            print("❌ Server dependencies not available.")
-            print("💡 Install with: pip install fastapi uvicorn qdrant-client langchain")
-    
-    elif args.command == 'discover':
-        if DISCOVERY_AVAILABLE:
-            print("🔍 Running agent and tool discovery...")
-            results = auto_discover_all(watch_directories=args.directories)
-        else:
-            print("❌ Discovery not available. Install dependencies: pip install -e .")
-        
-        print(f"\n✅ Discovery Results:")
-        print(f"   📋 Tools discovered: {len(results['tools'])}")
-        print(f"   ⚡ Commands discovered: {len(results['commands'])}")
-        print(f"   🤖 Agents discovered: {len(results['agents'])}")
-        
-        if results['tools']:
-            print(f"\n📋 Tools by category:")
-            from collections import defaultdict
-            tools_by_category = defaultdict(list)
-            for tool in results['tools']:
-                tools_by_category[tool.category].append(tool.name)
-            
-            for category, tool_names in tools_by_category.items():
-                print(f"   {category}: {', '.join(tool_names)}")
-    
-    elif args.command == 'demo':
-        if EXAMPLES_AVAILABLE:
-            print("🎭 Running Math Agent Evolution Demonstration")
-            demonstrate_math_agent_evolution()
-        else:
-            print("❌ Demo not available. Install dependencies: pip install -e .")
-    
-    elif args.command == 'watch':
-        if DISCOVERY_AVAILABLE:
-            print(f"👀 Starting protocol watcher for directories: {args.directories}")
-            print(f"⏱️  Scan interval: {args.interval} seconds")
-            
-            # Start file system watcher
-            start_protocol_watcher(
-                watch_directories=args.directories,
-                scan_interval=args.interval
-            )
-        else:
-            print("❌ Watch not available. Install dependencies: pip install -e .")
-        
-        # Keep running
-        try:
-            import time
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\n👋 Protocol watcher stopped")
-    
-    else:
+    # Each subcommand registered its handler via set_defaults(func=...)
+    if not hasattr(args, 'func'):
         parser.print_help()
+        return
+    
+    args.func(args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -31,13 +31,25 @@ Usage:
 """
 
 import os
+import re
+import ast
+import logging
+import uuid
+import math
+import builtins
+import atexit
 import asyncio
+import threading
+import functools
+import weakref
+from contextlib import contextmanager
+from concurrent.futures import Future, wait
 from typing import List, Optional, Dict, Any, Callable
 
 from langchain_groq import ChatGroq
 from langchain.agents import create_agent
-from langchain_core.tools import tool, Tool
-from langchain_core.messages import HumanMessage, AIMessage
+from langchain_core.tools import tool, Tool, StructuredTool
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import Command
 
@@ -46,13 +58,14 @@ try:
 except ImportError:
     HumanInTheLoopMiddleware = None
 
-from src.tools import get_basic_tools, get_math_tools, get_science_tools, get_coding_tools
+from src.tools import get_basic_tools, get_math_tools, get_science_tools, get_coding_tools, get_all_tools
 from src.rag import setup_rag_tools
 from src.commands import CommandRegistry, create_math_commands, create_science_commands, create_coding_commands, create_agent_commands
+from src.semantic_cache import SemanticResponseCache
 
 try:
     from src.toolbox import get_toolbox, ToolboxManager
-    from src.tool_generator import ToolGenerator, ToolAssistant
+    from src.tool_generator import ToolGenerator, get_tool_assistant
     TOOLBOX_AVAILABLE = True
 except ImportError:
     TOOLBOX_AVAILABLE = False
@@ -63,20 +76,168 @@ except ImportError:
     MEMORY_AVAILABLE = False
 
 
+_log = logging.getLogger("agent")
+
+DEFAULT_SYSTEM_PROMPT = "You are a helpful AI assistant specialized in coding, math, and science."
+RAG_PROMPT_SUFFIX = " Use the search tools to find relevant information before answering questions."
+
+
+# Memory calls made from the synchronous chat API run on one long-lived event
+# loop in a daemon thread, instead of a new loop created and torn down per turn
+_BG_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BG_LOOP_LOCK = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared background event loop, starting it on first use."""
+    global _BG_LOOP
+    if _BG_LOOP is None:
+        with _BG_LOOP_LOCK:
+            if _BG_LOOP is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="agent-memory-loop", daemon=True).start()
+                _BG_LOOP = loop
+    return _BG_LOOP
+
+
+def _run_in_background_loop(coro):
+    """Run a coroutine on the shared background loop and wait for its result."""
+    loop = _get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Synchronous Agent methods cannot be called from the memory loop; use achat()")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+# Memory writes still in flight; drained at exit so the daemon loop thread
+# is not killed halfway through storing the last exchange
+_PENDING_MEMORY_WRITES: set = set()
+
+
+def _submit_to_background_loop(coro) -> Future:
+    """Schedule a coroutine on the shared background loop without waiting."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+
+
+def _memory_write_done(future: Future):
+    """Done-callback for fire-and-forget memory writes."""
+    _PENDING_MEMORY_WRITES.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        _log.warning("memory write failed: %s", future.exception())
+
+
+@atexit.register
+def _drain_memory_writes():
+    """Wait for outstanding memory writes before the interpreter exits."""
+    if _PENDING_MEMORY_WRITES:
+        wait(list(_PENDING_MEMORY_WRITES), timeout=30)
+
+
+# Global LLM response cache
+_global_llm_cache = None
+
+
+def get_llm_response_cache():
+    """
+    Get the shared SQLite LLM response cache.
+    
+    Stored at $LANGCHAIN_CACHE_DB (default: .langchain.db in the current
+    directory). Returns None if langchain_community is not installed.
+    
+    Agents do not cache unless asked to:
+        agent = Agent(cache=get_llm_response_cache())
+    """
+    global _global_llm_cache
+    if _global_llm_cache is None:
+        try:
+            from langchain_community.cache import SQLiteCache
+        except ImportError:
+            return None
+        _global_llm_cache = SQLiteCache(
+            database_path=os.environ.get("LANGCHAIN_CACHE_DB", ".langchain.db")
+        )
+    return _global_llm_cache
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_model(model_name: str, temperature: float, kwargs_items: tuple) -> ChatGroq:
+    """Build one ChatGroq client per distinct configuration."""
+    return ChatGroq(model=model_name, temperature=temperature, **dict(kwargs_items))
+
+
+def _make_model(model_name: str, temperature: float, model_kwargs: Dict[str, Any]) -> ChatGroq:
+    """
+    Get a chat model client, reusing an existing one for identical settings.
+    
+    Chat models are stateless per request, so agents with the same model,
+    temperature and kwargs can share one client and its connection pool.
+    Configurations with unhashable kwargs get a fresh client.
+    """
+    kwargs_items = tuple(sorted(model_kwargs.items()))
+    try:
+        hash(kwargs_items)
+    except TypeError:
+        return ChatGroq(model=model_name, temperature=temperature, **model_kwargs)
+    return _cached_model(model_name, temperature, kwargs_items)
+
+
+# Start of each turn in a memory context: a (possibly "[Earlier]") "User:"
+# entry. Replies may contain blank lines, so turns are only split here.
+_TURN_START = re.compile(r"\n\n(?=(?:\[Earlier\] )?User: )")
+
+
+def _budget_trim(context: str, max_tokens: int = 4000) -> str:
+    """
+    Drop the oldest turns of a memory context until it fits a token budget.
+    
+    Tokens are estimated as words * 1.3, the same estimate MemoryManager
+    uses for session token counts. Whole turns (a "User:" entry and its
+    "Assistant:" reply, however many paragraphs) are removed from the
+    front, so the newest turns are kept and no turn is cut in half.
+    
+    Args:
+        context: Context string from MemoryManager.get_context_for_session
+        max_tokens: Token budget for the context
+    
+    Returns:
+        The context, trimmed to at most max_tokens estimated tokens
+    """
+    turns = _TURN_START.split(context)
+    costs = [len(turn.split()) * 1.3 for turn in turns]
+    total = sum(costs)
+    if total <= max_tokens:
+        return context
+    
+    start = 0
+    while total > max_tokens and start < len(turns):
+        total -= costs[start]
+        start += 1
+    return "\n\n".join(turns[start:])
+
+
 class Agent:
     """
     A flexible agent class that can be configured with any tools and capabilities.
     This follows the original simple design pattern from agent.py.
     """
     
+    # Set by subclasses whose compiled agent persists conversation state
+    checkpointer = None
+    
     def __init__(self, 
                  model_name: str = "openai/gpt-oss-120b",
                  temperature: float = 0,
-                 system_prompt: str = "You are a helpful AI assistant specialized in coding, math, and science.",
+                 system_prompt: str = DEFAULT_SYSTEM_PROMPT,
                  tools: List[Callable] = None,
                  enable_commands: bool = False,
                  enable_memory: bool = False,
                  memory_session_id: str = "default",
+                 cache: Any = None,
+                 enable_semantic_cache: bool = False,
                  **model_kwargs):
         """
         Initialize the agent.
@@ -87,14 +248,30 @@ class Agent:
             system_prompt: System prompt for the agent
             tools: Initial list of tools to add
             enable_commands: Whether to enable command system
+            cache: LLM response cache (a langchain BaseCache), or False to
+                bypass a globally configured cache. Off by default; pass
+                get_llm_response_cache() for the shared SQLite cache (path
+                set by $LANGCHAIN_CACHE_DB). A hit replays the stored answer
+                for an identical prompt, so only enable it for agents whose
+                tools return the same results every time (not weather,
+                time or other live data).
+            enable_semantic_cache: Reuse responses for messages similar in
+                meaning to earlier ones (see SemanticResponseCache). Only
+                applies to chat() without memory.
             **model_kwargs: Additional model parameters
         """
         self.model_name = model_name
         self.temperature = temperature
         self.system_prompt = system_prompt
         self.model_kwargs = model_kwargs
-        self.tools = []
+        self._tools_by_name: Dict[str, Callable] = {}  # name -> tool
         self.agent = None
+        # Tool changes only mark the compiled agent stale; it is rebuilt
+        # once, right before it is next used (see _ensure_agent)
+        self._dirty = True
+        # One thread per agent, so checkpointed turns continue the same
+        # conversation and keep a stable prompt prefix between calls
+        self._thread_id = str(uuid.uuid4())
         
         # Initialize command system if requested
         self.commands = CommandRegistry() if enable_commands else None
@@ -103,21 +280,26 @@ class Agent:
         self.enable_memory = enable_memory
         self.memory_session_id = memory_session_id
         self.memory_manager = None
+        # The last exchange handed to memory; written after chat returns
+        self._pending_memory_write: Optional[Future] = None
         
         if enable_memory and MEMORY_AVAILABLE:
             try:
                 from src.memory import get_memory_manager
                 self.memory_manager = get_memory_manager()
             except ImportError:
-                print("⚠️ Memory system not available")
+                _log.warning("memory system not available")
                 self.memory_manager = None
         
-        # Setup model
-        self.model = ChatGroq(
-            model=self.model_name,
-            temperature=self.temperature,
-            **self.model_kwargs
-        )
+        # Paraphrase-level response cache, checked before the agent runs
+        self.semantic_cache = SemanticResponseCache() if enable_semantic_cache else None
+        
+        model_kwargs = dict(self.model_kwargs)
+        if cache is not None:
+            model_kwargs["cache"] = cache
+        
+        # Setup model (shared with other agents using the same configuration)
+        self.model = _make_model(self.model_name, self.temperature, model_kwargs)
         
         # Add initial tools
         if tools:
@@ -126,29 +308,55 @@ class Agent:
             # Add basic tools by default
             self.add_tools(get_basic_tools())
     
+    @property
+    def tools(self) -> List[Callable]:
+        """The agent's tools, in the order they were added."""
+        return list(self._tools_by_name.values())
+    
+    @staticmethod
+    def _tool_name(tool_func: Callable) -> str:
+        """Name a tool is registered under (its .name, else its function name)."""
+        return getattr(tool_func, 'name', None) or getattr(tool_func, '__name__', str(tool_func))
+    
     def add_tool(self, tool_func: Callable):
         """
         Add a tool to the agent.
         
+        A tool with the same name as an existing one replaces it.
+        
         Args:
             tool_func: A function decorated with @tool or a Tool object
         """
-        self.tools.append(tool_func)
-        self._rebuild_agent()
+        self._tools_by_name[self._tool_name(tool_func)] = tool_func
+        self._dirty = True
     
     def add_tools(self, tools: List[Callable]):
         """Add multiple tools at once."""
-        self.tools.extend(tools)
-        self._rebuild_agent()
+        for tool_func in tools:
+            self._tools_by_name[self._tool_name(tool_func)] = tool_func
+        self._dirty = True
     
     def remove_tool(self, tool_name: str):
         """Remove a tool by name."""
-        self.tools = [t for t in self.tools if getattr(t, 'name', str(t)) != tool_name]
-        self._rebuild_agent()
+        if self._tools_by_name.pop(tool_name, None) is not None:
+            self._dirty = True
+    
+    @contextmanager
+    def bulk_update(self):
+        """
+        Apply a batch of tool changes and compile the agent once at the end.
+        
+        Usage:
+            with agent.bulk_update():
+                agent.add_tools(math_tools)
+                agent.remove_tool("get_weather")
+        """
+        yield self
+        self._ensure_agent()
     
     def list_tools(self) -> List[str]:
         """List all available tool names."""
-        return [getattr(tool, 'name', str(tool)) for tool in self.tools]
+        return list(self._tools_by_name)
     
     def load_tools_from_toolbox(self, category: str = None, tags: List[str] = None):
         """
@@ -159,7 +367,7 @@ class Agent:
             tags: Load tools matching specific tags
         """
         if not TOOLBOX_AVAILABLE:
-            print("⚠️  Toolbox system not available")
+            _log.warning("toolbox system not available")
             return
         
         toolbox = get_toolbox()
@@ -172,7 +380,7 @@ class Agent:
             tools = toolbox.get_all_tools()
         
         self.add_tools(tools)
-        print(f"✅ Loaded {len(tools)} tools from toolbox")
+        _log.info("loaded %d tools from toolbox", len(tools))
     
     def generate_and_add_tool(self, description: str, category: str = "custom") -> bool:
         """
@@ -186,10 +394,10 @@ class Agent:
             True if successful
         """
         if not TOOLBOX_AVAILABLE:
-            print("⚠️  Tool generator not available")
+            _log.warning("tool generator not available")
             return False
         
-        assistant = ToolAssistant()
+        assistant = get_tool_assistant()
         success, message, tool_func = assistant.create_tool_for_agent(
             self,
             tool_description=description,
@@ -197,101 +405,313 @@ class Agent:
             add_to_agent=True
         )
         
-        print(message)
+        _log.info("%s", message)
         return success
     
+    def _ensure_agent(self):
+        """Compile the agent if it was never built or its tools changed."""
+        if self._dirty or self.agent is None:
+            self._rebuild_agent()
+    
+    def _sorted_tools(self) -> List[Callable]:
+        """
+        The agent's tools ordered by name.
+        
+        Tool schemas are sent in this order on every request, so the same
+        tool set always yields the same prompt prefix, however it was built.
+        """
+        return [self._tools_by_name[name] for name in sorted(self._tools_by_name)]
+    
     def _rebuild_agent(self):
         """Rebuild the agent with current tools and configuration."""
         self.agent = create_agent(
             model=self.model,
-            tools=self.tools,
+            tools=self._sorted_tools(),
             system_prompt=self.system_prompt
         )
+        self._dirty = False
     
-    def chat(self, message: str, session_id: str = None, **kwargs) -> str:
+    def _build_messages(self, message: str, context: str = None) -> List[Dict[str, str]]:
+        """
+        Build the input messages for one turn.
+        
+        The system prompt (set once in create_agent) stays the unchanged
+        first message. Memory context goes in its own message after it,
+        and the user's text is sent as-is. Earlier turns then share a
+        byte-identical prefix, so provider prompt caches can match it.
+        
+        Args:
+            message: The user message
+            context: Optional conversation context from memory
+        
+        Returns:
+            Messages to pass as the agent's "messages" input
+        """
+        messages = []
+        if context:
+            # Same window MemoryManager builds the context for
+            context = _budget_trim(context, self.memory_manager.max_context_tokens)
+        if context:
+            messages.append({
+                "role": "system",
+                "content": f"Previous conversation context:\n{context}"
+            })
+        messages.append({"role": "user", "content": message})
+        return messages
+    
+    def chat(self, message: str, session_id: str = None, stream: bool = False, **kwargs):
         """
         Send a message to the agent and get a response.
         
         Args:
             message: The user message
             session_id: Optional session ID for memory (overrides default)
+            stream: Return a generator of text chunks (as stream_chat does)
+                instead of the assembled response
             **kwargs: Additional parameters for the agent
         
         Returns:
-            The agent's response as a string
+            The agent's response as a string, or a chunk generator if stream
         """
-        if not self.agent:
-            self._rebuild_agent()
+        if stream:
+            return self.stream_chat(message, session_id=session_id, **kwargs)
+        
+        # Answers depend on conversation context when memory is on
+        semantic_cache = None if self.enable_memory and self.memory_manager else self.semantic_cache
+        if semantic_cache is not None:
+            vector = semantic_cache.embed(message)
+            cached = semantic_cache.lookup(vector)
+            if cached is not None:
+                return cached
+        
+        # Same single code path as streaming; drain it and keep the final reply
+        reply = self._stream_reply(message, session_id, **kwargs)
+        try:
+            while True:
+                next(reply)
+        except StopIteration as done:
+            response = done.value
+        
+        if semantic_cache is not None:
+            semantic_cache.add(vector, response)
+        return response
+    
+    def batch_chat(self, messages: List[str], max_concurrency: int = 8, **kwargs) -> List[str]:
+        """
+        Send several independent messages and get all responses.
+        
+        Without memory, the messages run through the agent's batch API, up to
+        max_concurrency at a time. With memory enabled, each turn's context
+        depends on the previous one, so they are sent in order through chat.
+        
+        Args:
+            messages: User messages
+            max_concurrency: Maximum requests in flight at once
+            **kwargs: Additional parameters for the agent
         
-        # Handle memory integration
+        Returns:
+            Responses in message order
+        """
         if self.enable_memory and self.memory_manager:
-            actual_session_id = session_id or self.memory_session_id
-            
-            # Get conversation context
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                context = loop.run_until_complete(
-                    self.memory_manager.get_context_for_session(actual_session_id)
-                )
-                
-                # Enhance message with context
-                if context:
-                    enhanced_message = f"""Previous conversation context:
-{context}
-
-Current message: {message}"""
-                else:
-                    enhanced_message = message
-                
-                # Get response
-                response = self.agent.invoke({
-                    "messages": [{"role": "user", "content": enhanced_message}]
-                }, **kwargs)
-                
-                response_content = response["messages"][-1].content
-                
-                # Store in memory
-                loop.run_until_complete(
-                    self.memory_manager.add_message(
-                        session_id=actual_session_id,
-                        message=message,  # Store original message, not enhanced
-                        response=response_content
-                    )
-                )
-                
-                return response_content
-                
-            finally:
-                loop.close()
-        else:
-            # Standard chat without memory
-            response = self.agent.invoke({
-                "messages": [{"role": "user", "content": message}]
-            }, **kwargs)
-            
-            return response["messages"][-1].content
+            return [self.chat(message, **kwargs) for message in messages]
+        
+        self._ensure_agent()
+        
+        configs, kwargs = self._batch_configs(len(messages), max_concurrency, kwargs)
+        results = self.agent.batch(
+            [{"messages": self._build_messages(message)} for message in messages],
+            config=configs,
+            **kwargs
+        )
+        return [result["messages"][-1].content for result in results]
     
-    def stream_chat(self, message: str, **kwargs):
+    async def abatch_chat(self, messages: List[str], max_concurrency: int = 8, **kwargs) -> List[str]:
         """
-        Stream the agent's response.
+        Async version of batch_chat.
+        
+        Args:
+            messages: User messages
+            max_concurrency: Maximum requests in flight at once
+            **kwargs: Additional parameters for the agent
+        
+        Returns:
+            Responses in message order
+        """
+        if self.enable_memory and self.memory_manager:
+            return [await self.achat(message, **kwargs) for message in messages]
+        
+        self._ensure_agent()
+        
+        configs, kwargs = self._batch_configs(len(messages), max_concurrency, kwargs)
+        results = await self.agent.abatch(
+            [{"messages": self._build_messages(message)} for message in messages],
+            config=configs,
+            **kwargs
+        )
+        return [result["messages"][-1].content for result in results]
+    
+    def _store_exchange(self, session_id: str, message: str, response: str):
+        """Write an exchange to memory in the background without waiting for it."""
+        future = _submit_to_background_loop(
+            self.memory_manager.add_message(
+                session_id=session_id,
+                message=message,
+                response=response
+            )
+        )
+        _PENDING_MEMORY_WRITES.add(future)
+        future.add_done_callback(_memory_write_done)
+        self._pending_memory_write = future
+    
+    def _batch_configs(self, count: int, max_concurrency: int, kwargs: Dict[str, Any]):
+        """
+        Build one run config per batch item from the caller's kwargs.
+        
+        max_concurrency is merged into any config the caller passed. With a
+        checkpointer, each item gets its own thread_id (unless the caller
+        chose one), since concurrent runs must not share a thread.
+        
+        Returns:
+            (list of configs, kwargs without "config")
+        """
+        kwargs = dict(kwargs)
+        base = {**(kwargs.pop("config", None) or {}), "max_concurrency": max_concurrency}
+        configurable = base.get("configurable", {})
+        if self.checkpointer is None or "thread_id" in configurable:
+            return [base] * count, kwargs
+        return [
+            {**base, "configurable": {**configurable, "thread_id": str(uuid.uuid4())}}
+            for _ in range(count)
+        ], kwargs
+    
+    def _with_thread(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Add this agent's thread_id to the run config when it has a checkpointer."""
+        if self.checkpointer is None or "config" in kwargs:
+            return kwargs
+        return {**kwargs, "config": {"configurable": {"thread_id": self._thread_id}}}
+    
+    def flush_memory(self):
+        """Block until this agent's last background memory write has finished."""
+        pending = self._pending_memory_write
+        if pending is not None:
+            wait([pending])
+            self._pending_memory_write = None
+    
+    async def achat(self, message: str, session_id: str = None, **kwargs) -> str:
+        """
+        Async version of chat for callers already running an event loop.
+        
+        Memory calls are awaited directly on the caller's loop.
+        
+        Args:
+            message: The user message
+            session_id: Optional session ID for memory (overrides default)
+            **kwargs: Additional parameters for the agent
+        
+        Returns:
+            The agent's response as a string
+        """
+        self._ensure_agent()
+        
+        use_memory = self.enable_memory and self.memory_manager
+        actual_session_id = session_id or self.memory_session_id
+        context = None
+        
+        if use_memory:
+            if self._pending_memory_write is not None:
+                await asyncio.to_thread(self.flush_memory)
+            if self.memory_manager.has_session(actual_session_id):
+                context = await self.memory_manager.get_context_for_session(actual_session_id)
+        
+        response = await self.agent.ainvoke({
+            "messages": self._build_messages(message, context)
+        }, **self._with_thread(kwargs))
+        
+        response_content = response["messages"][-1].content
+        
+        if use_memory:
+            await self.memory_manager.add_message(
+                session_id=actual_session_id,
+                message=message,
+                response=response_content
+            )
+        
+        return response_content
+    
+    def stream_chat(self, message: str, session_id: str = None, **kwargs):
+        """
+        Stream the agent's response token by token.
         
         Args:
             message: The user message
+            session_id: Optional session ID for memory (overrides default)
             **kwargs: Additional parameters for the agent
         
         Yields:
-            Chunks of the agent's response
+            Text chunks of the agent's response as the model produces them
         """
-        if not self.agent:
-            self._rebuild_agent()
+        yield from self._stream_reply(message, session_id, **kwargs)
+    
+    def _stream_reply(self, message: str, session_id: str = None, **kwargs):
+        """
+        Run one turn, yielding model text as it arrives.
         
-        for chunk in self.agent.stream({
-            "messages": [{"role": "user", "content": message}]
-        }, **kwargs):
-            if "messages" in chunk:
-                yield chunk["messages"][-1].content
+        The generator's return value is the final reply: the text of the last
+        AI message, excluding any text the model produced before tool calls.
+        That reply is what gets written to memory.
+        
+        Models that return whole messages instead of tokens (non-streaming
+        models, or LLM cache hits) produce no chunks; their reply is read from
+        the final graph state and yielded as a single chunk.
+        """
+        self._ensure_agent()
+        
+        use_memory = self.enable_memory and self.memory_manager
+        actual_session_id = session_id or self.memory_session_id
+        context = None
+        
+        # Get conversation context (including the previous turn's write)
+        if use_memory:
+            self.flush_memory()
+            # A new session has no context; skip the round trip to the loop
+            if self.memory_manager.has_session(actual_session_id):
+                context = _run_in_background_loop(
+                    self.memory_manager.get_context_for_session(actual_session_id)
+                )
+        
+        # "messages" mode yields model tokens as they arrive, so callers see
+        # the first words immediately; "values" keeps the final state
+        reply_id, parts, state = None, [], None
+        for mode, payload in self.agent.stream({
+            "messages": self._build_messages(message, context)
+        }, stream_mode=["messages", "values"], **self._with_thread(kwargs)):
+            if mode == "values":
+                state = payload
+                continue
+            token, _metadata = payload
+            if isinstance(token, AIMessageChunk) and isinstance(token.content, str) and token.content:
+                if token.id != reply_id:
+                    reply_id, parts = token.id, []
+                parts.append(token.content)
+                yield token.content
+        
+        final = state["messages"][-1] if state and state.get("messages") else None
+        # Chunks belong to the final message unless both ids say otherwise
+        if parts and (final is None or None in (final.id, reply_id) or final.id == reply_id):
+            response_content = "".join(parts)
+        elif isinstance(final, AIMessage) and isinstance(final.content, str):
+            # The final message arrived whole, without token chunks
+            response_content = final.content
+            if response_content:
+                yield response_content
+        else:
+            response_content = "".join(parts)
+        
+        # Store in memory off the critical path; the reply returns right away
+        if use_memory:
+            self._store_exchange(actual_session_id, message, response_content)
+        
+        return response_content
     
     def enable_commands(self):
         """Enable the command system for this agent."""
@@ -377,11 +797,12 @@ class HITLAgent(Agent):
         
         self.agent = create_agent(
             model=self.model,
-            tools=self.tools,
+            tools=self._sorted_tools(),
             system_prompt=self.system_prompt + " You must get approval for sensitive operations.",
             middleware=middleware,
             checkpointer=self.checkpointer
         )
+        self._dirty = False
     
     def chat_with_approval(self, message: str, thread_id: str = None) -> Dict[str, Any]:
         """
@@ -399,11 +820,17 @@ class HITLAgent(Agent):
             thread_id = str(uuid7())
         
         config = {"configurable": {"thread_id": thread_id}}
+        self._ensure_agent()
         
-        # Initial request
-        events = list(self.agent.stream({
+        # Initial request; only the last state update is needed, and the
+        # run can stop at the first interrupt
+        last_event = None
+        for event in self.agent.stream({
             "messages": [{"role": "user", "content": message}]
-        }, config=config))
+        }, config=config):
+            if "__interrupt__" in event:
+                break
+            last_event = event
         
         # Check for interrupts
         state = self.agent.get_state(config)
@@ -416,10 +843,10 @@ class HITLAgent(Agent):
             }
         
         # No interrupts, return response
-        if events and "messages" in events[-1]:
+        if last_event and "messages" in last_event:
             return {
                 "status": "completed",
-                "response": events[-1]["messages"][-1].content,
+                "response": last_event["messages"][-1].content,
                 "thread_id": thread_id
             }
         
@@ -437,16 +864,17 @@ class HITLAgent(Agent):
             The agent's final response
         """
         config = {"configurable": {"thread_id": thread_id}}
+        self._ensure_agent()
         resume_payload = {
             interrupt_id: {"decisions": [{"type": "approve"}]}
         }
         
-        resume_output = list(self.agent.stream(
-            Command(resume=resume_payload), config=config
-        ))
+        last_event = None
+        for event in self.agent.stream(Command(resume=resume_payload), config=config):
+            last_event = event
         
-        if resume_output and "messages" in resume_output[-1]:
-            return resume_output[-1]["messages"][-1].content
+        if last_event and "messages" in last_event:
+            return last_event["messages"][-1].content
         
         # Check final state if no events
         final_state = self.agent.get_state(config)
@@ -461,45 +889,129 @@ def create_simple_agent(**kwargs) -> Agent:
     """Create a basic agent with default tools."""
     return Agent(**kwargs)
 
-async def create_rag_agent(urls: List[str] = None, documents: List[str] = None, **kwargs) -> Agent:
-    """Create an agent with RAG capabilities - RAG as tools, not separate agent."""
-    agent = Agent(**kwargs)
+# Retriever tools per source set, shared by every RAG agent in the process
+# so repeat sources are not re-fetched, re-split and re-embedded
+_RAG_TOOLS_CACHE: Dict[tuple, List] = {}
+# asyncio locks belong to one event loop, so keep one lock per source set
+# per running loop; different source sets build concurrently
+_RAG_TOOLS_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, asyncio.Lock]]" = weakref.WeakKeyDictionary()
+_RAG_TOOLS_LOCKS_GUARD = threading.Lock()
+
+
+def _rag_tools_lock(key: tuple) -> asyncio.Lock:
+    """Return the lock for a source set in the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _RAG_TOOLS_LOCKS_GUARD:
+        locks = _RAG_TOOLS_LOCKS.setdefault(loop, {})
+        return locks.setdefault(key, asyncio.Lock())
+
+
+async def _get_rag_tools(urls: List[str] = None,
+                         documents: List[str] = None,
+                         embed_batch_size: int = 64) -> List:
+    """Build (or reuse) retriever tools for the given URLs or documents."""
+    if urls:
+        key = ("urls", frozenset(urls), "documents")
+    elif documents:
+        key = ("documents", frozenset(documents), "documents")
+    else:
+        key = ("default",)
     
-    # Add RAG tools to the agent
-    try:
-        if urls or documents:
-            # Import here to avoid circular imports
-            from src.rag import RAGManager
-            rag_manager = RAGManager()
-            
-            if urls:
-                rag_tools = await rag_manager.setup_from_urls(urls, "documents")
+    async with _rag_tools_lock(key):
+        if key not in _RAG_TOOLS_CACHE:
+            if urls or documents:
+                # Import here to avoid circular imports
+                from src.rag import RAGManager
+                rag_manager = RAGManager()
+                
+                if urls:
+                    rag_tools = await rag_manager.setup_from_urls(
+                        urls, "documents", embed_batch_size=embed_batch_size
+                    )
+                else:
+                    rag_tools = await rag_manager.setup_from_documents(
+                        documents, "documents", embed_batch_size=embed_batch_size
+                    )
             else:
-                rag_tools = await rag_manager.setup_from_documents(documents, "documents")
-            
-            agent.add_tools(rag_tools)
-        else:
-            # Use default setup
-            rag_tools = await setup_rag_tools()
-            agent.add_tools(rag_tools)
-    except Exception as e:
-        print(f"Failed to setup RAG tools: {e}")
+                # Use default setup
+                rag_tools = await setup_rag_tools()
+            _RAG_TOOLS_CACHE[key] = rag_tools
     
-    # Update system prompt for RAG usage
-    agent.system_prompt += " Use the search tools to find relevant information before answering questions."
-    agent._rebuild_agent()
+    return list(_RAG_TOOLS_CACHE[key])
+
+
+async def create_rag_agent(urls: List[str] = None,
+                           documents: List[str] = None,
+                           embed_batch_size: int = 64,
+                           **kwargs) -> Agent:
+    """
+    Create an agent with RAG capabilities - RAG as tools, not separate agent.
+    
+    embed_batch_size sets how many chunks go into each embedding call while
+    the documents are indexed.
+    """
+    # The agent starts with its final prompt, so it is compiled only once
+    kwargs["system_prompt"] = kwargs.get("system_prompt", DEFAULT_SYSTEM_PROMPT) + RAG_PROMPT_SUFFIX
+    agent = Agent(**kwargs)
+    
+    # Add RAG tools to the agent
+    with agent.bulk_update():
+        try:
+            agent.add_tools(await _get_rag_tools(urls, documents, embed_batch_size))
+        except Exception as e:
+            _log.warning("failed to set up RAG tools: %s", e)
     
     return agent
 
+# Builtins visible to execute_python snippets. This keeps them away from
+# imports, files and this module's globals, but it is not a security boundary;
+# in production, use a sandboxed environment.
+_SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        "abs", "all", "any", "bin", "bool", "chr", "complex", "dict", "divmod",
+        "enumerate", "filter", "float", "format", "frozenset", "hex", "int",
+        "isinstance", "len", "list", "map", "max", "min", "oct", "ord", "pow",
+        "range", "repr", "reversed", "round", "set", "slice", "sorted", "str",
+        "sum", "tuple", "zip", "ArithmeticError", "Exception", "ValueError",
+        "TypeError", "ZeroDivisionError",
+    )
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_python(source: str):
+    """
+    Compile a snippet once and cache the code objects by source.
+    
+    A trailing expression is split off and compiled in "eval" mode, so
+    multi-statement snippets still report the value of their last line.
+    
+    Returns:
+        (statements code or None, final expression code or None)
+    """
+    tree = ast.parse(source, mode="exec")
+    expression = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        expression = compile(ast.Expression(tree.body.pop().value), "<execute_python>", "eval")
+    statements = compile(tree, "<execute_python>", "exec") if tree.body else None
+    return statements, expression
+
+
 def create_coding_agent(enable_commands: bool = True, **kwargs) -> Agent:
     """Create an agent specialized for coding tasks."""
     
     @tool
     def execute_python(code: str) -> str:
-        """Execute Python code and return the result. Use with caution."""
+        """Execute Python code and return the value of its last expression. Use with caution."""
+        if not code.strip():
+            return "No code provided"
         try:
-            # In production, use a sandboxed environment
-            result = eval(code) if code.strip() else "No code provided"
+            statements, expression = _compile_python(code)
+            namespace = {"__builtins__": _SAFE_BUILTINS, "math": math}
+            if statements is not None:
+                exec(statements, namespace)
+            result = eval(expression, namespace) if expression is not None else None
             return str(result)
         except Exception as e:
             return f"Error: {str(e)}"
@@ -564,17 +1076,13 @@ def create_memory_enhanced_agent(enable_commands: bool = True, **kwargs) -> Agen
 You can search through our previous conversations to find relevant context and information.
 Use the memory search tools when users refer to previous discussions, ask about past topics,
 or when you need historical context to provide better responses.""",
+        # Comprehensive tool set, passed up front so the agent is built once
+        tools=get_all_tools(),
         enable_memory=True,
         enable_commands=enable_commands,
         **kwargs
     )
     
-    # Add comprehensive tool set
-    agent.add_tools(get_basic_tools())
-    agent.add_tools(get_math_tools())
-    agent.add_tools(get_science_tools())
-    agent.add_tools(get_coding_tools())
-    
     if enable_commands:
         agent.enable_commands()
         agent.add_commands(create_math_commands())
@@ -585,46 +1093,76 @@ or when you need historical context to provide better responses.""",
     return agent
 
 
+_SUB_AGENT_FACTORIES = {
+    "math": create_math_agent,
+    "science": create_science_agent,
+    "coding": create_coding_agent,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_sub_agent(kind: str) -> Agent:
+    """Build a supervisor's specialized sub-agent on first use and share it."""
+    return _SUB_AGENT_FACTORIES[kind]()
+
+
+def _delegate_tool(get_agent: Callable[[], Agent], name: str, description: str) -> StructuredTool:
+    """
+    Wrap a sub-agent as a supervisor tool with sync and async entry points.
+    
+    When the supervisor issues several delegations in one turn, the tool node
+    runs them concurrently (gathered under ainvoke, threaded under invoke),
+    so the turn takes as long as the slowest sub-agent rather than the sum.
+    
+    Args:
+        get_agent: Returns the sub-agent; called on each delegation so the
+            sub-agent is only built once it is actually needed
+        name: Tool name shown to the supervisor
+        description: Tool description shown to the supervisor
+    """
+    def ask(query: str) -> str:
+        return get_agent().chat(query)
+    
+    async def aask(query: str) -> str:
+        return await get_agent().achat(query)
+    
+    return StructuredTool.from_function(
+        func=ask,
+        coroutine=aask,
+        name=name,
+        description=description
+    )
+
+
 async def create_multi_agent_supervisor(**kwargs) -> Agent:
     """
     Create a supervisor agent that can delegate to other specialized agents.
     This follows the original multi-agent pattern from agent.py.
     """
     
-    # Create specialized agents as tools
-    math_agent = create_math_agent()
-    science_agent = create_science_agent()
-    coding_agent = create_coding_agent()
+    # Specialized agents are built on their first delegation and shared
+    # process-wide, so unused domains cost nothing
+    supervisor_tools = [
+        _delegate_tool(functools.partial(_get_sub_agent, "math"), "ask_math_agent",
+                       "Ask the math agent for mathematical calculations and problem solving."),
+        _delegate_tool(functools.partial(_get_sub_agent, "science"), "ask_science_agent",
+                       "Ask the science agent for physics, chemistry, and scientific calculations."),
+        _delegate_tool(functools.partial(_get_sub_agent, "coding"), "ask_coding_agent",
+                       "Ask the coding agent for programming help and code analysis."),
+    ]
     
-    # Try to add RAG agent
+    # Try to add RAG agent; whether it loads decides if the tool is offered,
+    # so it is still built up front
     try:
         rag_agent = await create_rag_agent()
     except:
         rag_agent = None
     
-    @tool
-    def ask_math_agent(query: str) -> str:
-        """Ask the math agent for mathematical calculations and problem solving."""
-        return math_agent.chat(query)
-    
-    @tool
-    def ask_science_agent(query: str) -> str:
-        """Ask the science agent for physics, chemistry, and scientific calculations."""
-        return science_agent.chat(query)
-    
-    @tool
-    def ask_coding_agent(query: str) -> str:
-        """Ask the coding agent for programming help and code analysis."""
-        return coding_agent.chat(query)
-    
-    supervisor_tools = [ask_math_agent, ask_science_agent, ask_coding_agent]
-    
     if rag_agent:
-        @tool
-        def ask_research_agent(query: str) -> str:
-            """Ask the research agent to search documents and provide information."""
-            return rag_agent.chat(query)
-        supervisor_tools.append(ask_research_agent)
+        supervisor_tools.append(
+            _delegate_tool(lambda: rag_agent, "ask_research_agent",
+                           "Ask the research agent to search documents and provide information.")
+        )
     
     supervisor = Agent(
         system_prompt="""You are a supervisor agent that coordinates multiple specialized agents.
@@ -26,20 +26,130 @@ Usage:
     print(result)  # "Hello, Alice!"
 """
 
+import sys
 import inspect
-from typing import Dict, Callable, Any, Optional, List, get_type_hints
+from types import MappingProxyType
+from typing import Dict, Callable, Any, Optional, List, Mapping, Tuple, get_type_hints
 from dataclasses import dataclass, field
 from functools import wraps
 
 
+# Signature and parameter info per (code object, defaults). Factories such
+# as create_math_commands define fresh closures on every call; they share
+# code objects, so their signatures are inspected only once per process.
+_PARAMETERS_CACHE: Dict[tuple, Tuple[inspect.Signature, Mapping[str, Dict[str, Any]]]] = {}
+
+
+def _parameter_info(func: Callable) -> Tuple[inspect.Signature, Mapping[str, Dict[str, Any]]]:
+    """
+    Build (or reuse) the signature and parameter info for a command function.
+    
+    A leading self parameter is skipped, so methods can be decorated in a
+    class body and registered bound. The parameter info is read-only, since
+    one mapping is shared by every function with the same code.
+    """
+    target = inspect.unwrap(func)  # @_safe wrappers all share one code object
+    try:
+        key = (target.__code__, target.__defaults__, tuple(sorted((target.__kwdefaults__ or {}).items())))
+        hash(key)
+    except (AttributeError, TypeError):
+        key = None  # Not a plain function, or unhashable defaults
+    if key in _PARAMETERS_CACHE:
+        return _PARAMETERS_CACHE[key]
+    
+    sig = inspect.signature(func)
+    # Annotations that are already types are used as-is; get_type_hints is
+    # only needed to resolve string (forward reference) annotations
+    annotations = getattr(func, '__annotations__', {})
+    if any(isinstance(hint, str) for hint in annotations.values()):
+        type_hints = get_type_hints(func)
+    else:
+        type_hints = annotations
+    
+    parameters = {}
+    for param_name, param in sig.parameters.items():
+        if param_name == 'self' and not parameters:
+            continue
+        param_info = {
+            'type': type_hints.get(param_name, str),
+            'required': param.default == inspect.Parameter.empty,
+            'default': param.default if param.default != inspect.Parameter.empty else None
+        }
+        parameters[param_name] = param_info
+    
+    info = (sig, MappingProxyType(parameters))
+    if key is not None:
+        _PARAMETERS_CACHE[key] = info
+    return info
+
+
+# Argument preparers generated per parameter layout (see _compile_preparer)
+_PREPARER_FACTORIES: Dict[tuple, Callable] = {}
+
+
+def _compile_preparer(parameters: Mapping[str, Dict[str, Any]],
+                      defaults: Dict[str, Any]) -> Callable[[Mapping[str, Any]], Dict[str, Any]]:
+    """
+    Generate an argument-preparing function specialized to a parameter list.
+    
+    The per-parameter checks of the generic loop are unrolled into straight
+    line code, the way dataclasses generates __init__. The source depends only
+    on names, which are required, and which have defaults; one factory per
+    layout is compiled and reused, and the default values are bound per command.
+    
+    Args:
+        parameters: Command parameter info
+        defaults: Default values for optional parameters
+    
+    Returns:
+        Function mapping user-provided kwargs to the call's kwargs; raises
+        ValueError for a missing required parameter
+    """
+    layout = tuple(
+        (name, info['required'], name in defaults)
+        for name, info in parameters.items()
+    )
+    factory = _PREPARER_FACTORIES.get(layout)
+    if factory is None:
+        lines = ["def make(defaults):", "    def prepare(provided):", "        p = {}"]
+        for name, required, has_default in layout:
+            lines.append(f"        if {name!r} in provided: p[{name!r}] = provided[{name!r}]")
+            if required:
+                message = f"Required parameter '{name}' not provided"
+                lines.append(f"        else: raise ValueError({message!r})")
+            elif has_default:
+                lines.append(f"        else: p[{name!r}] = defaults[{name!r}]")
+        lines += ["        return p", "    return prepare"]
+        
+        namespace = {}
+        exec(compile("\n".join(lines), "<command arguments>", "exec"), namespace)
+        factory = _PREPARER_FACTORIES[layout] = namespace["make"]
+    return factory(defaults)
+
+
 @dataclass
 class CommandInfo:
     """Information about a command."""
     name: str
     function: Callable
     description: str
-    parameters: Dict[str, Any] = field(default_factory=dict)
+    parameters: Mapping[str, Any] = field(default_factory=dict)
     usage: str = ""
+    # Derived from parameters, for argument checks and no-argument calls
+    required: Tuple[str, ...] = field(init=False, repr=False)
+    has_required: bool = field(init=False, repr=False)
+    defaults: Dict[str, Any] = field(init=False, repr=False)
+    prepare: Callable[[Mapping[str, Any]], Dict[str, Any]] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.required = tuple(name for name, info in self.parameters.items() if info['required'])
+        self.has_required = bool(self.required)
+        self.defaults = {
+            name: info['default']
+            for name, info in self.parameters.items()
+            if not info['required'] and info['default'] is not None
+        }
+        self.prepare = _compile_preparer(self.parameters, self.defaults)
 
 
 def command(name: str, description: str = None, usage: str = None):
@@ -53,24 +163,14 @@ def command(name: str, description: str = None, usage: str = None):
     """
     def decorator(func: Callable) -> Callable:
         # Store command metadata on the function
-        func._command_name = name
+        # Interned, so registry lookups of interned names match by identity
+        func._command_name = sys.intern(name)
         func._command_description = description or func.__doc__ or f"Execute {name} command"
         func._command_usage = usage or f"/{name}"
         
-        # Extract parameter info from function signature
-        sig = inspect.signature(func)
-        type_hints = get_type_hints(func)
-        
-        parameters = {}
-        for param_name, param in sig.parameters.items():
-            param_info = {
-                'type': type_hints.get(param_name, str),
-                'required': param.default == inspect.Parameter.empty,
-                'default': param.default if param.default != inspect.Parameter.empty else None
-            }
-            parameters[param_name] = param_info
-        
-        func._command_parameters = parameters
+        # Extract parameter info from function signature. The signature is
+        # kept on the function so later inspect.signature calls reuse it.
+        func.__signature__, func._command_parameters = _parameter_info(func)
         return func
     
     return decorator
@@ -83,48 +183,55 @@ class CommandRegistry:
     
     def __init__(self):
         self.commands: Dict[str, CommandInfo] = {}
+        # Dispatch table: name length -> name -> command. Rebuilt lazily
+        # after commands are added or removed (see _dispatch_table)
+        self._by_len: Optional[Dict[int, Dict[str, CommandInfo]]] = None
+        # Sorted command names for /list and the not-found message's
+        # command list, also reset on add/remove
+        self._sorted_names: Optional[List[str]] = None
+        self._available: Optional[str] = None
         self._add_built_in_commands()
     
-    def _add_built_in_commands(self):
-        """Add built-in utility commands."""
-        
-        @command("help", "Show available commands", "/help [command_name]")
-        def help_command(command_name: str = None) -> str:
-            if command_name:
-                if command_name in self.commands:
-                    cmd = self.commands[command_name]
-                    result = f"**/{cmd.name}** - {cmd.description}\n"
-                    if cmd.usage:
-                        result += f"Usage: {cmd.usage}\n"
-                    if cmd.parameters:
-                        result += "Parameters:\n"
-                        for param, info in cmd.parameters.items():
-                            required = "required" if info['required'] else "optional"
-                            default = f" (default: {info['default']})" if info['default'] is not None else ""
-                            result += f"  - {param}: {info['type'].__name__} ({required}){default}\n"
-                    return result
-                else:
-                    return f"Command '{command_name}' not found."
-            
-            result = "Available Commands:\n"
-            for name, cmd in self.commands.items():
-                result += f"  /{name} - {cmd.description}\n"
-            result += "\nUse /help <command_name> for detailed help on a specific command."
-            return result
+    # Built-in commands are decorated once, here, and registered bound to
+    # each registry in _add_built_in_commands
+    
+    @command("help", "Show available commands", "/help [command_name]")
+    def help_command(self, command_name: str = None) -> str:
+        if command_name:
+            if command_name in self.commands:
+                cmd = self.commands[command_name]
+                lines = [f"**/{cmd.name}** - {cmd.description}"]
+                if cmd.usage:
+                    lines.append(f"Usage: {cmd.usage}")
+                if cmd.parameters:
+                    lines.append("Parameters:")
+                    for param, info in cmd.parameters.items():
+                        required = "required" if info['required'] else "optional"
+                        default = f" (default: {info['default']})" if info['default'] is not None else ""
+                        lines.append(f"  - {param}: {info['type'].__name__} ({required}){default}")
+                lines.append("")
+                return "\n".join(lines)
+            else:
+                return f"Command '{command_name}' not found."
         
-        @command("list", "List all available commands")
-        def list_commands() -> str:
-            if not self.commands:
-                return "No commands available."
-            
-            result = "Available Commands:\n"
-            for name in sorted(self.commands.keys()):
-                result += f"  /{name}\n"
-            return result
+        lines = ["Available Commands:"]
+        lines.extend(f"  /{name} - {cmd.description}" for name, cmd in self.commands.items())
+        lines.append("\nUse /help <command_name> for detailed help on a specific command.")
+        return "\n".join(lines)
+    
+    @command("list", "List all available commands")
+    def list_commands(self) -> str:
+        if not self.commands:
+            return "No commands available."
         
-        # Add built-in commands to registry
-        self.add_command(help_command)
-        self.add_command(list_commands)
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.commands)
+        return "Available Commands:\n" + "".join(f"  /{name}\n" for name in self._sorted_names)
+    
+    def _add_built_in_commands(self):
+        """Add built-in utility commands."""
+        self.add_command(self.help_command)
+        self.add_command(self.list_commands)
     
     def add_command(self, func: Callable) -> None:
         """
@@ -145,6 +252,7 @@ class CommandRegistry:
         )
         
         self.commands[func._command_name] = command_info
+        self._commands_changed()
     
     def remove_command(self, name: str) -> bool:
         """
@@ -158,9 +266,25 @@ class CommandRegistry:
         """
         if name in self.commands:
             del self.commands[name]
+            self._commands_changed()
             return True
         return False
     
+    def _commands_changed(self):
+        """Drop everything derived from self.commands."""
+        self._by_len = None
+        self._sorted_names = None
+        self._available = None
+    
+    def _dispatch_table(self) -> Dict[int, Dict[str, CommandInfo]]:
+        """Commands grouped by name length, so most misses are one int lookup."""
+        if self._by_len is None:
+            by_len: Dict[int, Dict[str, CommandInfo]] = {}
+            for name, info in self.commands.items():
+                by_len.setdefault(len(name), {})[name] = info
+            self._by_len = by_len
+        return self._by_len
+    
     def execute_command(self, command_str: str, **kwargs) -> str:
         """
         Execute a command by name.
@@ -172,54 +296,34 @@ class CommandRegistry:
         Returns:
             Command result as string
         """
-        # Remove leading / if present
-        command_name = command_str.lstrip('/')
+        # Remove one leading / if present. "//help" keeps a "/" and is
+        # reported as not found rather than silently run as /help.
+        command_name = command_str[1:] if command_str[:1] == '/' else command_str
+        if len(command_name) <= 16:
+            command_name = sys.intern(command_name)
         
-        if command_name not in self.commands:
-            available = ', '.join(self.commands.keys())
-            return f"Command '{command_name}' not found. Available commands: {available}"
-        
-        command_info = self.commands[command_name]
+        bucket = self._dispatch_table().get(len(command_name))
+        command_info = bucket.get(command_name) if bucket else None
+        if command_info is None:
+            if self._available is None:
+                self._available = ', '.join(self.commands.keys())
+            return f"Command '{command_name}' not found. Available commands: {self._available}"
         
         try:
-            # Validate and prepare arguments
-            prepared_kwargs = self._prepare_arguments(command_info, kwargs)
-            
-            # Execute the command
-            result = command_info.function(**prepared_kwargs)
+            if not kwargs and not command_info.has_required:
+                # No arguments given and none needed (/help, /list, /status...)
+                result = command_info.function(**command_info.defaults)
+            else:
+                # Validate and prepare arguments
+                prepared_kwargs = command_info.prepare(kwargs)
+                
+                # Execute the command
+                result = command_info.function(**prepared_kwargs)
             
             return str(result) if result is not None else "Command executed successfully."
             
         except Exception as e:
-            return f"Error executing command '{command_name}': {str(e)}"
-    
-    def _prepare_arguments(self, command_info: CommandInfo, provided_kwargs: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Prepare and validate command arguments.
-        
-        Args:
-            command_info: Command information
-            provided_kwargs: User-provided arguments
-            
-        Returns:
-            Prepared arguments dictionary
-        """
-        prepared = {}
-        
-        for param_name, param_info in command_info.parameters.items():
-            if param_name in provided_kwargs:
-                # Use provided value
-                value = provided_kwargs[param_name]
-                # TODO: Add type conversion/validation here if needed
-                prepared[param_name] = value
-            elif param_info['required']:
-                # Required parameter missing
-                raise ValueError(f"Required parameter '{param_name}' not provided")
-            elif param_info['default'] is not None:
-                # Use default value
-                prepared[param_name] = param_info['default']
-        
-        return prepared
+            return f"Error executing command '{command_name}': {_error_text(e)}"
     
     def get_command_info(self, name: str) -> Optional[CommandInfo]:
         """Get information about a command."""
@@ -230,32 +334,74 @@ class CommandRegistry:
         return list(self.commands.keys())
 
 
+# Tools used by the command factories, resolved on first use
+_TOOL_CACHE: Dict[str, Any] = {}
+
+
+def _get_tool(name: str):
+    """Get a tool from src.tools, importing it once per process."""
+    tool = _TOOL_CACHE.get(name)
+    if tool is None:
+        # Import here to avoid dependency issues
+        from src import tools
+        tool = _TOOL_CACHE[name] = getattr(tools, name)
+    return tool
+
+
+def _error_text(error: Exception) -> str:
+    """
+    Describe an exception without calling its __str__.
+    
+    Uses the message argument when it is a string, otherwise the exception's
+    type name, so arbitrary objects passed as exception arguments are never
+    formatted.
+    """
+    if error.args and isinstance(error.args[0], str):
+        return error.args[0]
+    return type(error).__name__
+
+
+def _safe(error_prefix: str):
+    """
+    Decorator that turns a command's exceptions into an error message.
+    
+    Keeps the error handling out of each command body. Apply it below
+    @command so the command keeps the wrapped function's signature.
+    
+    Args:
+        error_prefix: Text put before the error, e.g. "Calculation error"
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return f"{error_prefix}: {_error_text(e)}"
+        return wrapper
+    
+    return decorator
+
+
 # Convenience functions for common command patterns
 def create_math_commands() -> List[Callable]:
     """Create math-related commands."""
     
     @command("calc", "Quick calculation", "/calc <expression>")
+    @_safe("Calculation error")
     def quick_calc(expression: str) -> str:
         """Quick mathematical calculation."""
-        try:
-            # Import here to avoid dependency issues
-            from src.tools import advanced_calculator
-            # Properly invoke the LangChain tool
-            result = advanced_calculator.invoke({"expression": expression})
-            return result
-        except Exception as e:
-            return f"Calculation error: {e}"
+        # Properly invoke the LangChain tool
+        result = _get_tool("advanced_calculator").invoke({"expression": expression})
+        return result
     
     @command("solve", "Solve quadratic equation", "/solve <a> <b> <c>")
+    @_safe("Solve error")
     def solve_quadratic_cmd(a: float, b: float, c: float) -> str:
         """Solve quadratic equation ax² + bx + c = 0."""
-        try:
-            from src.tools import solve_quadratic
-            # Properly invoke the LangChain tool
-            result = solve_quadratic.invoke({"a": a, "b": b, "c": c})
-            return result
-        except Exception as e:
-            return f"Solve error: {e}"
+        # Properly invoke the LangChain tool
+        result = _get_tool("solve_quadratic").invoke({"a": a, "b": b, "c": c})
+        return result
     
     return [quick_calc, solve_quadratic_cmd]
 
@@ -264,33 +410,27 @@ def create_science_commands() -> List[Callable]:
     """Create science-related commands."""
     
     @command("convert", "Convert units", "/convert <value> <from_unit> <to_unit>")
+    @_safe("Conversion error")
     def unit_convert_cmd(value: float, from_unit: str, to_unit: str) -> str:
         """Convert between units."""
-        try:
-            from src.tools import unit_converter
-            # Properly invoke the LangChain tool
-            result = unit_converter.invoke({
-                "value": value, 
-                "from_unit": from_unit, 
-                "to_unit": to_unit
-            })
-            return result
-        except Exception as e:
-            return f"Conversion error: {e}"
+        # Properly invoke the LangChain tool
+        result = _get_tool("unit_converter").invoke({
+            "value": value, 
+            "from_unit": from_unit, 
+            "to_unit": to_unit
+        })
+        return result
     
     @command("physics", "Physics calculation", "/physics <formula> [parameters...]")
+    @_safe("Physics error")
     def physics_cmd(formula: str, **kwargs) -> str:
         """Perform physics calculations."""
-        try:
-            from src.tools import physics_calculator
-            # Properly invoke the LangChain tool
-            result = physics_calculator.invoke({
-                "calculation": formula, 
-                **kwargs
-            })
-            return result
-        except Exception as e:
-            return f"Physics error: {e}"
+        # Properly invoke the LangChain tool
+        result = _get_tool("physics_calculator").invoke({
+            "calculation": formula, 
+            **kwargs
+        })
+        return result
     
     return [unit_convert_cmd, physics_cmd]
 
@@ -299,32 +439,26 @@ def create_coding_commands() -> List[Callable]:
     """Create coding-related commands."""
     
     @command("analyze", "Analyze code", "/analyze <code> [language]")
+    @_safe("Analysis error")
     def analyze_code_cmd(code: str, language: str = "python") -> str:
         """Analyze code structure and quality."""
-        try:
-            from src.tools import code_analyzer
-            # Properly invoke the LangChain tool
-            result = code_analyzer.invoke({
-                "code": code, 
-                "language": language
-            })
-            return result
-        except Exception as e:
-            return f"Analysis error: {e}"
+        # Properly invoke the LangChain tool
+        result = _get_tool("code_analyzer").invoke({
+            "code": code, 
+            "language": language
+        })
+        return result
     
     @command("format", "Format JSON", "/format <json_string>")
+    @_safe("Format error")
     def format_json_cmd(json_string: str) -> str:
         """Format and validate JSON."""
-        try:
-            from src.tools import json_formatter
-            # Properly invoke the LangChain tool
-            result = json_formatter.invoke({
-                "json_string": json_string, 
-                "operation": "format"
-            })
-            return result
-        except Exception as e:
-            return f"Format error: {e}"
+        # Properly invoke the LangChain tool
+        result = _get_tool("json_formatter").invoke({
+            "json_string": json_string, 
+            "operation": "format"
+        })
+        return result
     
     return [analyze_code_cmd, format_json_cmd]
 
@@ -8,9 +8,12 @@ new tools and commands as they are added to the system.
 
 import os
 import sys
+import json
+import time
+import hashlib
 import importlib
 import inspect
-from typing import Dict, List, Any, Type, Callable, Set
+from typing import Dict, List, Any, Type, Callable, Set, Optional
 from pathlib import Path
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
@@ -53,6 +56,12 @@ class DiscoveryEngine:
         self.discovered_agents: Dict[str, Type] = {}
         self.watched_directories: Set[str] = set()
         
+        # Manifest of which modules in each watched directory contained
+        # tools/commands/agents, keyed by directory and tagged with a
+        # fingerprint of its files' mtimes (see load_manifest)
+        self.cache_path: Optional[str] = None
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        
     def add_watch_directory(self, directory: str):
         """Add directory to watch for new tools and commands."""
         path = Path(directory).resolve()
@@ -202,56 +211,97 @@ class DiscoveryEngine:
             
         return commands
     
-    def _scan_directory_for_tools(self, directory: str) -> List[ToolInfo]:
-        """Scan directory for Python files containing tools."""
-        tools = []
+    def load_manifest(self, cache_path: str):
+        """
+        Enable the on-disk discovery manifest.
+        
+        When a watched directory's files are unchanged since the manifest was
+        written (same paths and mtimes), directory scans only import the
+        modules that previously yielded results instead of every file.
         
+        Args:
+            cache_path: JSON file to read the manifest from and save it to
+        """
+        self.cache_path = cache_path
         try:
-            for file_path in Path(directory).rglob("*.py"):
-                if file_path.name.startswith("__"):
-                    continue
-                    
-                module_name = self._file_to_module_name(file_path, directory)
-                tools.extend(self._scan_module_for_tools(module_name))
+            with open(cache_path, "r") as f:
+                self._manifest = json.load(f)
+        except (OSError, ValueError):
+            self._manifest = {}
+    
+    def save_manifest(self):
+        """Write the discovery manifest, if enabled."""
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "w") as f:
+                json.dump(self._manifest, f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not write discovery cache {self.cache_path}: {e}")
+    
+    def _directory_fingerprint(self, directory: str) -> str:
+        """Hash the paths and modification times of a directory's Python files."""
+        entries = sorted(
+            (str(file_path), file_path.stat().st_mtime_ns)
+            for file_path in Path(directory).rglob("*.py")
+        )
+        return hashlib.sha256(json.dumps(entries).encode()).hexdigest()
+    
+    def _scan_directory(self, directory: str, kind: str, scan_module: Callable) -> List[Any]:
+        """
+        Scan a directory's modules with scan_module, using the manifest if valid.
+        
+        Args:
+            directory: Directory to scan
+            kind: Manifest key ("tools", "commands" or "agents")
+            scan_module: Per-module scanner returning a list of results
+        """
+        results = []
+        
+        try:
+            entry = None
+            module_names = None
+            
+            if self.cache_path:
+                fingerprint = self._directory_fingerprint(directory)
+                entry = self._manifest.get(directory)
+                if not entry or entry.get("fingerprint") != fingerprint:
+                    entry = self._manifest[directory] = {"fingerprint": fingerprint}
+                module_names = entry.get(kind)
+            
+            if module_names is None:
+                module_names = [
+                    self._file_to_module_name(file_path, directory)
+                    for file_path in Path(directory).rglob("*.py")
+                    if not file_path.name.startswith("__")
+                ]
+            
+            found = []
+            for module_name in module_names:
+                items = scan_module(module_name)
+                if items:
+                    found.append(module_name)
+                    results.extend(items)
+            
+            if entry is not None:
+                entry[kind] = found
                 
         except Exception as e:
             print(f"⚠️ Error scanning directory {directory}: {e}")
             
-        return tools
+        return results
+    
+    def _scan_directory_for_tools(self, directory: str) -> List[ToolInfo]:
+        """Scan directory for Python files containing tools."""
+        return self._scan_directory(directory, "tools", self._scan_module_for_tools)
     
     def _scan_directory_for_commands(self, directory: str) -> List[CommandInfo]:
         """Scan directory for Python files containing commands."""
-        commands = []
-        
-        try:
-            for file_path in Path(directory).rglob("*.py"):
-                if file_path.name.startswith("__"):
-                    continue
-                    
-                module_name = self._file_to_module_name(file_path, directory)
-                commands.extend(self._scan_module_for_commands(module_name))
-                
-        except Exception as e:
-            print(f"⚠️ Error scanning directory {directory}: {e}")
-            
-        return commands
+        return self._scan_directory(directory, "commands", self._scan_module_for_commands)
     
     def _scan_directory_for_agents(self, directory: str) -> List[Type]:
         """Scan directory for Python files containing agent classes."""
-        agents = []
-        
-        try:
-            for file_path in Path(directory).rglob("*.py"):
-                if file_path.name.startswith("__"):
-                    continue
-                    
-                module_name = self._file_to_module_name(file_path, directory)
-                agents.extend(self._scan_module_for_agents(module_name))
-                
-        except Exception as e:
-            print(f"⚠️ Error scanning directory {directory}: {e}")
-            
-        return agents
+        return self._scan_directory(directory, "agents", self._scan_module_for_agents)
     
     def _scan_module_for_tools(self, module_name: str) -> List[ToolInfo]:
         """Scan specific module for tool functions."""
@@ -433,7 +483,6 @@ class ProtocolWatcher:
     def scan_for_changes(self):
         """Scan watched directories for changes and update registry."""
         try:
-            import time
             current_time = time.time()
             
             for directory in self.discovery_engine.watched_directories:
@@ -475,15 +524,22 @@ def get_discovery_engine() -> DiscoveryEngine:
     return _global_discovery_engine
 
 
-def auto_discover_all(watch_directories: List[str] = None):
+def auto_discover_all(watch_directories: List[str] = None,
+                      cache_path: Optional[str] = None):
     """
     Automatically discover all tools, commands, and agents.
     
     Args:
         watch_directories: Directories to watch for new code
+        cache_path: Discovery manifest file; unchanged directories only
+            re-import the modules that had results last time. None (the
+            default) disables the manifest and writes no file.
     """
     engine = get_discovery_engine()
     
+    if cache_path:
+        engine.load_manifest(cache_path)
+    
     # Add watch directories
     if watch_directories:
         for directory in watch_directories:
@@ -494,6 +550,8 @@ def auto_discover_all(watch_directories: List[str] = None):
     commands = engine.discover_commands() 
     agents = engine.discover_agents()
     
+    engine.save_manifest()
+    
     print(f"🔍 Discovery complete:")
     print(f"   📋 Tools: {len(tools)}")
     print(f"   ⚡ Commands: {len(commands)}")
@@ -515,7 +573,6 @@ def start_protocol_watcher(watch_directories: List[str] = None, scan_interval: i
         scan_interval: Scan interval in seconds
     """
     import threading
-    import time
     
     engine = get_discovery_engine()
     
@@ -6,7 +6,9 @@ Provides scalable conversation memory with automatic summarization,
 temporal indexing, and RAG-based retrieval for long-term context management.
 """
 
+import re
 import json
+import hashlib
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
@@ -73,6 +75,9 @@ class ConversationMemoryManager:
         # In-memory session management
         self.active_sessions: Dict[str, Dict[str, Any]] = {}
         
+        # Background summarization, at most one task in flight per session
+        self._compression_tasks: Dict[str, asyncio.Task] = {}
+        
         # Summarization agent for compression
         self.summarizer = None
         self._init_summarizer()
@@ -101,8 +106,14 @@ Format your summaries as structured text that preserves searchable keywords.""",
                          message: str,
                          response: str,
                          urls: List[str] = None,
-                         metadata: Dict[str, Any] = None) -> str:
-        """Add message to conversation memory."""
+                         metadata: Dict[str, Any] = None,
+                         vector: Optional[List[float]] = None) -> str:
+        """
+        Add message to conversation memory.
+        
+        ``vector`` may carry a precomputed embedding of the exchange
+        ("User: ...\\nAssistant: ...") so storage skips the encoder call.
+        """
         timestamp = datetime.now()
         
         # Store in persistent storage
@@ -112,10 +123,61 @@ Format your summaries as structured text that preserves searchable keywords.""",
             response=response,
             timestamp=timestamp,
             urls=urls or [],
-            metadata=metadata or {}
+            metadata=metadata or {},
+            vector=vector
+        )
+        
+        self._track_message(session_id, timestamp, message, response, urls)
+        self.maybe_compress(session_id)
+        
+        return point_id
+    
+    async def add_messages_batch(self,
+                                 session_id: str,
+                                 items: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+                                 vectors = None) -> List[str]:
+        """
+        Add several exchanges to conversation memory at once.
+        
+        All exchanges are embedded in one encoder pass and written with a
+        single upsert, instead of one embed and upsert per add_message call.
+        
+        Args:
+            session_id: Session the exchanges belong to
+            items: (message, response, metadata) tuples; metadata may be None
+            vectors: Optional precomputed embeddings, one row per item
+                (e.g. an (N, D) array from np.load); skips the encoder pass
+        
+        Returns:
+            Point IDs in item order
+        """
+        timestamp = datetime.now()
+        
+        point_ids = await self.conversation_storage.store_messages(
+            session_id=session_id,
+            items=items,
+            timestamp=timestamp,
+            vectors=vectors
         )
         
-        # Update active session tracking
+        for message, response, _ in items:
+            self._track_message(session_id, timestamp, message, response)
+        self.maybe_compress(session_id)
+        
+        return point_ids
+    
+    def has_session(self, session_id: str) -> bool:
+        """Whether the session has tracked messages (no storage access)."""
+        session = self.active_sessions.get(session_id)
+        return bool(session and session["messages"])
+    
+    def _track_message(self,
+                       session_id: str,
+                       timestamp: datetime,
+                       message: str,
+                       response: str,
+                       urls: List[str] = None):
+        """Record an exchange in the in-memory session tracking."""
         if session_id not in self.active_sessions:
             self.active_sessions[session_id] = {
                 "messages": [],
@@ -140,12 +202,53 @@ Format your summaries as structured text that preserves searchable keywords.""",
         
         if urls:
             session["urls"].update(urls)
+    
+    def maybe_compress(self, session_id: str) -> Optional[asyncio.Task]:
+        """
+        Schedule summarization of a session once it crosses the token threshold.
         
-        # Check if summarization is needed
-        if session["token_count"] > self.summarization_threshold:
-            await self._maybe_summarize_session(session_id)
+        Summarization runs as a background task on the running event loop, so
+        callers storing messages never wait on the summarizer LLM. A session
+        has at most one compression in flight; later calls reuse it.
         
-        return point_id
+        Returns:
+            The pending compression task, or None if none is needed
+        """
+        session = self.active_sessions.get(session_id)
+        if not session or session["token_count"] <= self.summarization_threshold:
+            return None
+        
+        task = self._compression_tasks.get(session_id)
+        if task is not None and not task.done() and not task.get_loop().is_closed():
+            return task
+        
+        task = asyncio.get_running_loop().create_task(self._maybe_summarize_session(session_id))
+        self._compression_tasks[session_id] = task
+        task.add_done_callback(lambda done: self._compression_finished(session_id, done))
+        return task
+    
+    def _compression_finished(self, session_id: str, task: asyncio.Task):
+        """Forget a finished compression task unless a newer one replaced it."""
+        if self._compression_tasks.get(session_id) is task:
+            del self._compression_tasks[session_id]
+    
+    async def wait_for_compression(self, session_id: str = None):
+        """
+        Wait for pending background compression on the running event loop.
+        
+        Callers that run memory operations on a short-lived event loop should
+        await this before closing the loop, or the pending summary is dropped.
+        
+        Args:
+            session_id: Only wait for this session (default: all sessions)
+        """
+        loop = asyncio.get_running_loop()
+        pending = [
+            task for sid, task in list(self._compression_tasks.items())
+            if (session_id is None or sid == session_id) and task.get_loop() is loop
+        ]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
     
     async def _maybe_summarize_session(self, session_id: str):
         """Conditionally summarize session if it exceeds thresholds."""
@@ -181,7 +284,8 @@ Extract:
 
 Provide a structured summary that maintains searchable context."""
             
-            summary_response = self.summarizer.chat(summary_prompt)
+            # The summarizer call is blocking; keep it off the event loop
+            summary_response = await asyncio.to_thread(self.summarizer.chat, summary_prompt)
             
             # Create summary record
             summary = ConversationSummary(
@@ -201,12 +305,13 @@ Provide a structured summary that maintains searchable context."""
             await self.conversation_storage.store_message(
                 session_id=f"{session_id}_summary",
                 message="CONVERSATION_SUMMARY",
-                response=json.dumps(asdict(summary)),
+                response=json.dumps(asdict(summary), default=str),
                 timestamp=datetime.now(),
                 metadata={"type": "summary", "original_session": session_id}
             )
             
-            # Update session - keep recent messages
+            # Update session - keep recent messages, including any that
+            # arrived while the summary was being generated
             session["messages"] = session["messages"][len(messages_to_summarize):]
             session["token_count"] *= 0.5  # Approximate remaining tokens
             
@@ -228,7 +333,6 @@ Provide a structured summary that maintains searchable context."""
                 topics.append(words[i + 1])
         
         # Extract capitalized words as potential topics
-        import re
         capitalized = re.findall(r'\b[A-Z][a-z]+\b', summary_text)
         topics.extend(capitalized[:5])  # Limit to top 5
         
@@ -254,10 +358,56 @@ Provide a structured summary that maintains searchable context."""
         
         return results
     
+    async def search_memory_batch(self,
+                                queries: List[str],
+                                session_id: str = None,
+                                time_range: Tuple[datetime, datetime] = None,
+                                urls: List[str] = None,
+                                limit: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Search conversation memory for several queries in a single request.
+        
+        Returns:
+            One result list per query, in query order
+        """
+        start_time, end_time = time_range if time_range else (None, None)
+        
+        return await self.conversation_storage.search_conversations_batch(
+            queries=queries,
+            session_id=session_id,
+            start_time=start_time,
+            end_time=end_time,
+            urls=urls,
+            limit=limit
+        )
+    
+    @staticmethod
+    def _context_sort_key(result: Dict[str, Any]) -> Tuple[str, str]:
+        """Order search hits by (timestamp, content hash) for a stable context."""
+        content = f"{result['message']}\n{result['response']}"
+        return (
+            result.get("timestamp", ""),
+            hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+        )
+    
     async def get_context_for_session(self,
                                     session_id: str,
-                                    max_tokens: int = None) -> str:
-        """Get conversation context for a session with smart truncation."""
+                                    max_tokens: int = None,
+                                    sort_items: bool = True) -> str:
+        """
+        Get conversation context for a session with smart truncation.
+        
+        Args:
+            session_id: Session to build context for
+            max_tokens: Token budget (default: max_context_tokens)
+            sort_items: Order retrieved history by (timestamp, content hash)
+                instead of search score. The context is then byte-identical for
+                the same stored history, which keeps provider prompt caches
+                warm. Changing this ordering invalidates cached prefixes.
+        
+        Returns:
+            Formatted context string, or "" if the session has no history
+        """
         max_tokens = max_tokens or self.max_context_tokens
         
         # Get active session messages
@@ -281,6 +431,8 @@ Provide a structured summary that maintains searchable context."""
                 session_id=session_id,
                 limit=5
             )
+            if sort_items:
+                relevant_context.sort(key=self._context_sort_key)
             
             # Build context from search results + recent messages
             context_parts = []
@@ -467,6 +619,7 @@ Current message: {message}"""
                         response=response
                     )
                 )
+                loop.run_until_complete(memory_manager.wait_for_compression(session_id))
                 
                 return response
                 
@@ -488,7 +641,7 @@ if __name__ == "__main__":
     
     memory_manager = get_memory_manager()
     
-    # Simulate conversation
+    # Simulate conversation (turns of one session are stored in order)
     async def test_memory():
         await memory_manager.add_message(
             session_id="test_session",
@@ -502,15 +655,34 @@ if __name__ == "__main__":
             response="For image classification, you might want to consider using CNNs with TensorFlow or PyTorch."
         )
         
-        # Search memory
-        results = await memory_manager.search_memory(
-            query="machine learning Python",
-            session_id="test_session"
+        # Independent searches run concurrently
+        results, recent = await asyncio.gather(
+            memory_manager.search_memory(
+                query="machine learning Python",
+                session_id="test_session"
+            ),
+            memory_manager.search_memory(
+                query="image classification",
+                session_id="test_session",
+                time_range=(datetime.now() - timedelta(hours=1), datetime.now())
+            )
         )
         
         print(f"Found {len(results)} relevant memories")
         for result in results:
             print(f"- {result['message'][:50]}...")
+        print(f"Found {len(recent)} memories from the last hour")
+        
+        await memory_manager.wait_for_compression()
+    
+    # The test is I/O-bound on Qdrant and embedding calls; use uvloop's
+    # event loop when it is installed (asyncio.Runner keeps 3.11 support)
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
     
-    asyncio.run(test_memory())
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(test_memory())
     print("✅ Memory system test completed")
\ No newline at end of file
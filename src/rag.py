@@ -7,6 +7,12 @@ Supports web scraping, document loading, and vector search.
 """
 
 import os
+import re
+import json
+import uuid
+import asyncio
+import functools
+from pathlib import Path
 import bs4
 from typing import List, Optional, Dict, Any
 from langchain_community.document_loaders import WebBaseLoader
@@ -14,9 +20,34 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_qdrant import QdrantVectorStore
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.tools import create_retriever_tool
+from langchain_core.embeddings import Embeddings
 from langchain_core.documents import Document
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import Distance, VectorParams, PointStruct
+
+# Embedding batches in flight at once while indexing a collection
+MAX_CONCURRENT_EMBED_BATCHES = 4
+
+
+class _QueryCachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that memoizes query vectors.
+    
+    Retrievers embed every search query; repeated queries (common across
+    agents sharing a collection) reuse the vector instead of re-encoding.
+    Document embedding passes straight through.
+    """
+    
+    def __init__(self, embeddings: Embeddings, maxsize: int = 1024):
+        self.embeddings = embeddings
+        self._embed_query = functools.lru_cache(maxsize=maxsize)(embeddings.embed_query)
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+    
+    def embed_query(self, text: str) -> List[float]:
+        # Copy so callers cannot mutate the cached vector
+        return list(self._embed_query(text))
 
 
 class RAGManager:
@@ -49,7 +80,9 @@ class RAGManager:
         self.chunk_overlap = chunk_overlap
         self.vector_size = vector_size
         
-        self.embedding_model = HuggingFaceEmbeddings(model_name=embedding_model_name)
+        self.embedding_model = _QueryCachedEmbeddings(
+            HuggingFaceEmbeddings(model_name=embedding_model_name)
+        )
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, 
             chunk_overlap=chunk_overlap
@@ -62,7 +95,8 @@ class RAGManager:
     async def setup_from_urls(self, 
                             urls: List[str], 
                             collection_name: str = "web_docs",
-                            css_selector: Dict[str, Any] = None) -> List:
+                            css_selector: Dict[str, Any] = None,
+                            embed_batch_size: int = 64) -> List:
         """
         Setup RAG from web URLs.
         
@@ -70,6 +104,7 @@ class RAGManager:
             urls: List of URLs to scrape
             collection_name: Name for the vector collection
             css_selector: CSS selector configuration for scraping
+            embed_batch_size: Chunks per embed_documents call
         
         Returns:
             List of retriever tools
@@ -86,17 +121,19 @@ class RAGManager:
         )
         docs = await loader.aload()
         
-        return await self._setup_collection(docs, collection_name)
+        return await self._setup_collection(docs, collection_name, embed_batch_size)
     
     async def setup_from_documents(self, 
                                  documents: List[str], 
-                                 collection_name: str = "text_docs") -> List:
+                                 collection_name: str = "text_docs",
+                                 embed_batch_size: int = 64) -> List:
         """
         Setup RAG from text documents.
         
         Args:
             documents: List of document texts
             collection_name: Name for the vector collection
+            embed_batch_size: Chunks per embed_documents call
         
         Returns:
             List of retriever tools
@@ -104,15 +141,45 @@ class RAGManager:
         # Convert strings to Document objects
         docs = [Document(page_content=doc) for doc in documents]
         
-        return await self._setup_collection(docs, collection_name)
+        return await self._setup_collection(docs, collection_name, embed_batch_size)
+    
+    async def _embed_in_batches(self, texts: List[str], batch_size: int) -> List[List[float]]:
+        """
+        Embed texts in batches, several batches at a time.
+        
+        Each batch is one embed_documents call, run in a worker thread so
+        the calls overlap for both local models and remote endpoints.
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per embed_documents call
+        
+        Returns:
+            One vector per text, in order
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBED_BATCHES)
+        
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.embedding_model.embed_documents, batch)
+        
+        batches = await asyncio.gather(*(
+            embed_batch(texts[i:i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ))
+        return [vector for batch in batches for vector in batch]
     
-    async def _setup_collection(self, docs: List[Document], collection_name: str) -> List:
+    async def _setup_collection(self,
+                                docs: List[Document],
+                                collection_name: str,
+                                embed_batch_size: int = 64) -> List:
         """
         Internal method to setup a vector collection.
         
         Args:
             docs: List of documents to index
             collection_name: Name for the collection
+            embed_batch_size: Chunks per embed_documents call
         
         Returns:
             List of retriever tools
@@ -140,8 +207,29 @@ class RAGManager:
             embedding=self.embedding_model,
         )
         
-        # Add documents
-        await vectorstore.aadd_documents(splits)
+        # Embed chunks in concurrent batches, then write them in the
+        # payload layout QdrantVectorStore reads back
+        vectors = await self._embed_in_batches(
+            [split.page_content for split in splits], embed_batch_size
+        )
+        points = [
+            PointStruct(
+                id=uuid.uuid4().hex,
+                vector=vector,
+                payload={
+                    vectorstore.content_payload_key: split.page_content,
+                    vectorstore.metadata_payload_key: split.metadata,
+                },
+            )
+            for split, vector in zip(splits, vectors)
+        ]
+        # Upsert in fixed-size batches to bound request size, off the event loop
+        for start in range(0, len(points), embed_batch_size):
+            await asyncio.to_thread(
+                self.client.upsert,
+                collection_name=collection_name,
+                points=points[start:start + embed_batch_size]
+            )
         
         # Store collection reference
         self.collections[collection_name] = vectorstore
@@ -203,9 +291,6 @@ class URLCollectionManager:
     def _load_registry(self) -> Dict[str, Any]:
         """Load existing URL registry from storage."""
         try:
-            import json
-            from pathlib import Path
-            
             if Path(self.storage_file).exists():
                 with open(self.storage_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -218,8 +303,6 @@ class URLCollectionManager:
     def _save_registry(self):
         """Save URL registry to storage with alphabetical ordering."""
         try:
-            import json
-            
             # Sort by name for consistent alphabetical order
             sorted_registry = dict(sorted(self.url_registry.items()))
             
@@ -234,7 +317,6 @@ class URLCollectionManager:
         Maintains alphabetical order with numbered succession.
         """
         # Clean base name (alphanumeric + underscores only)
-        import re
         clean_name = re.sub(r'[^a-zA-Z0-9_]', '_', base_name.lower().strip())
         clean_name = re.sub(r'_+', '_', clean_name).strip('_')
         
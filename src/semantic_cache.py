@@ -0,0 +1,147 @@
+"""
+Semantic Response Cache
+=======================
+
+Caches agent responses by the meaning of the message rather than its exact
+text, so paraphrases ("what's 2+2?" / "compute 2 plus 2") reuse an answer.
+
+Messages are embedded and bucketed with random-projection LSH (several hash
+tables of sign bits over random hyperplanes). A lookup only compares the
+query against entries sharing a bucket, and returns a cached response when
+the best cosine similarity reaches the threshold.
+
+Usage:
+    from src.semantic_cache import SemanticResponseCache
+    
+    cache = SemanticResponseCache(threshold=0.95)
+    vector = cache.embed("What's 2 + 2?")
+    response = cache.lookup(vector)
+    if response is None:
+        response = agent.chat("What's 2 + 2?")
+        cache.add(vector, response)
+
+Works best for FAQ-style agents; answers that depend on tool results or
+changing world state should not be cached.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class SemanticResponseCache:
+    """
+    Embedding-similarity cache of responses using random-projection LSH.
+    """
+    
+    def __init__(self,
+                 embeddings = None,
+                 threshold: float = 0.95,
+                 num_tables: int = 8,
+                 num_bits: int = 12,
+                 max_entries: int = 1024,
+                 seed: int = 0):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            embeddings: LangChain embeddings used for messages (default:
+                HuggingFace all-MiniLM-L6-v2, created on first use)
+            threshold: Minimum cosine similarity for a hit
+            num_tables: Number of LSH hash tables
+            num_bits: Hyperplanes (hash bits) per table
+            max_entries: Entries kept before the cache is reset
+            seed: Seed for the random hyperplanes
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.num_tables = num_tables
+        self.num_bits = num_bits
+        self.max_entries = max_entries
+        self.seed = seed
+        
+        self._lock = threading.Lock()
+        self._planes: Optional[np.ndarray] = None  # (tables, bits, dim)
+        self._bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self.clear()
+    
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._reset()
+    
+    def _reset(self):
+        """Empty the cache; the caller must hold self._lock."""
+        self._vectors: List[np.ndarray] = []
+        self._responses: List[str] = []
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.num_tables)]
+    
+    def __len__(self) -> int:
+        return len(self._responses)
+    
+    def embed(self, message: str) -> np.ndarray:
+        """Embed a message as a unit-length float32 vector."""
+        if self.embeddings is None:
+            from langchain_huggingface import HuggingFaceEmbeddings
+            self.embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+        
+        vector = np.asarray(self.embeddings.embed_query(message), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _bucket_keys(self, vector: np.ndarray) -> np.ndarray:
+        """Hash a vector to one bucket key per table."""
+        if self._planes is None:
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal(
+                (self.num_tables, self.num_bits, vector.shape[0])
+            ).astype(np.float32)
+        
+        bits = (self._planes @ vector) > 0  # (tables, bits)
+        return bits.astype(np.int64) @ self._bit_weights
+    
+    def lookup(self, vector: np.ndarray) -> Optional[str]:
+        """
+        Find a cached response for a message embedding.
+        
+        Args:
+            vector: Embedding from embed()
+        
+        Returns:
+            The most similar cached response at or above the threshold, or None
+        """
+        with self._lock:
+            if not self._responses:
+                return None
+            
+            keys = self._bucket_keys(vector)
+            candidates = set()
+            for table, key in zip(self._tables, keys.tolist()):
+                candidates.update(table.get(key, ()))
+            if not candidates:
+                return None
+            
+            indices = np.fromiter(candidates, dtype=np.int64)
+            similarities = np.stack([self._vectors[i] for i in indices]) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return self._responses[indices[best]]
+            return None
+    
+    def add(self, vector: np.ndarray, response: str):
+        """
+        Cache a response under a message embedding.
+        
+        Args:
+            vector: Embedding from embed()
+            response: Response to return for similar messages
+        """
+        with self._lock:
+            if len(self._responses) >= self.max_entries:
+                self._reset()
+            index = len(self._responses)
+            self._vectors.append(vector)
+            self._responses.append(response)
+            for table, key in zip(self._tables, self._bucket_keys(vector).tolist()):
+                table.setdefault(key, []).append(index)
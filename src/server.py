@@ -7,11 +7,14 @@ tools, and commands. Provides a complete REST API for agent interactions.
 """
 
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, StreamingResponse
 import uvicorn
 import asyncio
+import threading
+import weakref
 from datetime import datetime
 import json
 
@@ -21,12 +24,18 @@ from src.protocol import (
 )
 
 
+# Server-sent event lines for /chat/stream. The done marker never changes, and
+# chunk lines only need the chunk text itself JSON-encoded.
+_STREAM_CHUNK_LINE = 'data: {{"chunk": {}, "done": false}}\\n\\n'
+_STREAM_DONE_LINE = f"data: {json.dumps({'chunk': '', 'done': True})}\\n\\n"
+
+
 class AgentProtocolServer:
     """
     FastAPI server that automatically generates endpoints for registered agents.
     """
     
-    def __init__(self, registry: AgentRegistry = None):
+    def __init__(self, registry: AgentRegistry = None, max_agent_instances: int = 256):
         self.registry = registry or get_agent_registry()
         self.app = FastAPI(
             title="LangChain Agent Base Protocol API",
@@ -48,6 +57,17 @@ class AgentProtocolServer:
         # Session management (simple in-memory for now)
         self.sessions: Dict[str, Dict[str, Any]] = {}
         
+        # Agent instances keyed by (name, resolved version, session, options).
+        # Agents hold conversation state (memory session, checkpointer
+        # thread, caches), so clients only share an instance through a
+        # session_id; least recently used instances are evicted. The
+        # expensive parts (model clients, RAG tools) are shared by the
+        # agent module's own caches.
+        self._agent_instances: OrderedDict[tuple, Any] = OrderedDict()
+        self.max_agent_instances = max_agent_instances
+        # Agents are not thread-safe; turns on one instance run one at a time
+        self._agent_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = weakref.WeakKeyDictionary()
+        
         self._setup_routes()
     
     def _setup_routes(self):
@@ -105,17 +125,15 @@ class AgentProtocolServer:
         async def chat_with_agent(request: ChatRequest):
             """Send a message to an agent and get a response."""
             try:
-                # Get agent instance
-                agent = self.registry.create_agent_instance(
+                # Get agent instance and its card (for version info)
+                agent, card = self._resolve_agent(
                     request.agent_name, 
-                    request.agent_version
+                    request.agent_version,
+                    session_id=request.session_id
                 )
                 
-                # Get agent card for version info
-                card = self.registry.get_agent_card(request.agent_name, request.agent_version)
-                
                 # Process message
-                response = agent.chat(request.message)
+                response = await self._chat(agent, request.message, request.session_id)
                 
                 # Update session if provided
                 if request.session_id:
@@ -135,18 +153,27 @@ class AgentProtocolServer:
         async def stream_chat_with_agent(request: ChatRequest):
             """Stream chat response from agent."""
             try:
-                agent = self.registry.create_agent_instance(
+                agent = self._get_agent(
                     request.agent_name, 
-                    request.agent_version
+                    request.agent_version,
+                    session_id=request.session_id
                 )
                 
+                lock = self._agent_lock(agent)
+                
                 async def generate_stream():
+                    # Poll rather than block a thread, so a client that
+                    # disconnects while waiting never leaves the lock held
+                    while not lock.acquire(blocking=False):
+                        await asyncio.sleep(0.05)
                     try:
-                        for chunk in agent.stream_chat(request.message):
-                            yield f"data: {json.dumps({'chunk': chunk, 'done': False})}\\n\\n"
-                        yield f"data: {json.dumps({'chunk': '', 'done': True})}\\n\\n"
+                        for chunk in agent.stream_chat(request.message, session_id=request.session_id):
+                            yield _STREAM_CHUNK_LINE.format(json.dumps(chunk))
+                        yield _STREAM_DONE_LINE
                     except Exception as e:
                         yield f"data: {json.dumps({'error': str(e)})}\\n\\n"
+                    finally:
+                        lock.release()
                 
                 return StreamingResponse(
                     generate_stream(), 
@@ -162,14 +189,12 @@ class AgentProtocolServer:
         async def execute_command(request: CommandRequest):
             """Execute a command on an agent."""
             try:
-                agent = self.registry.create_agent_instance(
+                agent, card = self._resolve_agent(
                     request.agent_name,
                     request.agent_version,
                     enable_commands=True  # Ensure commands are enabled
                 )
                 
-                card = self.registry.get_agent_card(request.agent_name, request.agent_version)
-                
                 # Execute command
                 result = agent.execute_command(request.command, **request.parameters)
                 
@@ -187,7 +212,7 @@ class AgentProtocolServer:
         async def list_agent_commands(agent_name: str, version: Optional[str] = None):
             """List all commands available for an agent."""
             try:
-                agent = self.registry.create_agent_instance(
+                agent = self._get_agent(
                     agent_name, 
                     version,
                     enable_commands=True
@@ -224,7 +249,7 @@ class AgentProtocolServer:
         async def list_agent_tools(agent_name: str, version: Optional[str] = None):
             """List all tools available for an agent."""
             try:
-                agent = self.registry.create_agent_instance(agent_name, version)
+                agent = self._get_agent(agent_name, version)
                 tools = agent.list_tools()
                 
                 return {
@@ -250,6 +275,9 @@ class AgentProtocolServer:
             """Clear session history."""
             if session_id in self.sessions:
                 del self.sessions[session_id]
+                # Drop the session's agents along with their state
+                for key in [key for key in self._agent_instances if key[2] == session_id]:
+                    del self._agent_instances[key]
                 return {"message": f"Session {session_id} cleared"}
             else:
                 raise HTTPException(status_code=404, detail="Session not found")
@@ -288,9 +316,10 @@ class AgentProtocolServer:
             """Process multiple chat requests in parallel."""
             async def process_request(req):
                 try:
-                    agent = self.registry.create_agent_instance(req.agent_name, req.agent_version)
-                    response = agent.chat(req.message)
-                    card = self.registry.get_agent_card(req.agent_name, req.agent_version)
+                    agent, card = self._resolve_agent(
+                        req.agent_name, req.agent_version, session_id=req.session_id
+                    )
+                    response = await self._chat(agent, req.message, req.session_id)
                     
                     return ChatResponse(
                         response=response,
@@ -307,6 +336,66 @@ class AgentProtocolServer:
             
             return {"results": results}
     
+    def _agent_lock(self, agent) -> threading.Lock:
+        """Get the lock serializing turns on an agent instance."""
+        lock = self._agent_locks.get(agent)
+        if lock is None:
+            lock = self._agent_locks[agent] = threading.Lock()
+        return lock
+    
+    async def _chat(self, agent, message: str, session_id: Optional[str] = None) -> str:
+        """
+        Run agent.chat in a worker thread, one turn per instance at a time.
+        
+        chat() is synchronous, so requests for different agents overlap their
+        LLM round-trips. Turns on the same instance (batch items or parallel
+        requests in one session) wait for each other, since an agent's
+        rebuilds, memory writes and checkpointer thread are not thread-safe.
+        """
+        lock = self._agent_lock(agent)
+        
+        def run_turn():
+            with lock:
+                return agent.chat(message, session_id=session_id)
+        
+        return await asyncio.to_thread(run_turn)
+    
+    def _get_agent(self, name: str, version: Optional[str] = None,
+                   session_id: Optional[str] = None, **kwargs):
+        """Return the agent instance for a request (see _resolve_agent)."""
+        return self._resolve_agent(name, version, session_id, **kwargs)[0]
+    
+    def _resolve_agent(self, name: str, version: Optional[str] = None,
+                       session_id: Optional[str] = None, **kwargs):
+        """
+        Resolve an agent's card and instance in one registry lookup.
+        
+        Requests with a session_id reuse that session's instance, so its
+        conversation state carries over between turns. Requests without one
+        get a fresh instance; model clients are shared between agents, so
+        building one is cheap.
+        
+        Returns:
+            Tuple of (agent instance, AgentCard)
+        """
+        card = self.registry.get_agent_card(name, version)
+        if not card:
+            raise ValueError(f"Agent {name}:{version} not found")
+        
+        if session_id is None:
+            return self.registry.create_agent_instance(name, card.version, **kwargs), card
+        
+        key = (name, card.version, session_id, tuple(sorted(kwargs.items())))
+        agent = self._agent_instances.get(key)
+        if agent is None:
+            agent = self.registry.create_agent_instance(name, card.version, **kwargs)
+            self._agent_instances[key] = agent
+            if len(self._agent_instances) > self.max_agent_instances:
+                self._agent_instances.popitem(last=False)
+        else:
+            self._agent_instances.move_to_end(key)
+        return agent, card
+    
     def _update_session(self, session_id: str, message: str, response: str, card: AgentCard):
         """Update session with new message exchange."""
         if session_id not in self.sessions:
@@ -7,14 +7,30 @@ with semantic search capabilities and metadata management.
 """
 
 import json
+import uuid
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 try:
     from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+    from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, QueryRequest, PayloadSchemaType
+    from qdrant_client.models import BinaryQuantization, BinaryQuantizationConfig, SearchParams, QuantizationSearchParams
+    from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType
     from langchain_huggingface import HuggingFaceEmbeddings
+    
+    # Optional quantization for the conversation and document collections
+    # (the quantization_config argument; off by default). int8 scalar codes
+    # keep recall close to full precision; 1-bit binary codes lose a lot of
+    # recall at 384 dimensions and suit only much larger embeddings. Quantized
+    # searches oversample on the codes and rescore with the original vectors.
+    # Quantization is set when a collection is created; existing collections
+    # keep their configuration.
+    SCALAR_QUANTIZATION = ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+    )
+    BINARY_QUANTIZATION = BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    _RESCORED_SEARCH = SearchParams(quantization=QuantizationSearchParams(rescore=True, oversampling=2.0))
     QDRANT_AVAILABLE = True
 except ImportError:
     QDRANT_AVAILABLE = False
@@ -31,14 +47,21 @@ class UnifiedQdrantStorage:
     def __init__(self,
                  qdrant_url: str = "localhost:6333",
                  embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
-                 vector_size: int = 384):
-        """Initialize unified Qdrant storage."""
+                 vector_size: int = 384,
+                 quantization_config = None):
+        """
+        Initialize unified Qdrant storage.
+        
+        quantization_config (e.g. SCALAR_QUANTIZATION) is applied to new
+        conversation and document collections; None stores full vectors.
+        """
         if not QDRANT_AVAILABLE:
             raise ImportError("Qdrant dependencies not available. Install with: pip install qdrant-client sentence-transformers")
         
         self.client = QdrantClient(url=qdrant_url)
         self.embeddings = HuggingFaceEmbeddings(model_name=embedding_model)
         self.vector_size = vector_size
+        self.quantization_config = quantization_config
         
         # Collection names for different data types
         self.collections = {
@@ -47,43 +70,59 @@ class UnifiedQdrantStorage:
             "documents": "rag_documents"
         }
         
+        # Storage wrappers are created once per collection; constructing one
+        # checks (or creates) its collection with a round-trip to Qdrant
+        self._storages: Dict[tuple, Any] = {}
+        
         self._setup_collections()
     
     def _setup_collections(self):
         """Setup all required collections."""
-        for collection_name in self.collections.values():
+        for kind, collection_name in self.collections.items():
             if not self.client.collection_exists(collection_name):
                 self.client.create_collection(
                     collection_name=collection_name,
                     vectors_config=VectorParams(
                         size=self.vector_size,
                         distance=Distance.COSINE
-                    )
+                    ),
+                    quantization_config=None if kind == "agent_cards" else self.quantization_config
                 )
     
     def get_agent_storage(self) -> 'AgentCardStorage':
         """Get AgentCardStorage using this unified client."""
-        return AgentCardStorage(
-            qdrant_client=self.client,
-            collection_name=self.collections["agent_cards"],
-            embeddings=self.embeddings
-        )
+        key = ("agent_cards", self.collections["agent_cards"])
+        if key not in self._storages:
+            self._storages[key] = AgentCardStorage(
+                qdrant_client=self.client,
+                collection_name=self.collections["agent_cards"],
+                embeddings=self.embeddings
+            )
+        return self._storages[key]
     
     def get_conversation_storage(self) -> 'ConversationMemoryStorage':
         """Get ConversationMemoryStorage using this unified client.""" 
-        return ConversationMemoryStorage(
-            qdrant_client=self.client,
-            collection_name=self.collections["conversations"],
-            embeddings=self.embeddings
-        )
+        key = ("conversations", self.collections["conversations"])
+        if key not in self._storages:
+            self._storages[key] = ConversationMemoryStorage(
+                qdrant_client=self.client,
+                collection_name=self.collections["conversations"],
+                embeddings=self.embeddings,
+                quantization_config=self.quantization_config
+            )
+        return self._storages[key]
     
     def get_rag_storage(self, collection_name: str = "documents") -> 'RAGDocumentStorage':
         """Get RAG document storage using this unified client."""
-        return RAGDocumentStorage(
-            qdrant_client=self.client,
-            collection_name=collection_name,
-            embeddings=self.embeddings
-        )
+        key = ("documents", collection_name)
+        if key not in self._storages:
+            self._storages[key] = RAGDocumentStorage(
+                qdrant_client=self.client,
+                collection_name=collection_name,
+                embeddings=self.embeddings,
+                quantization_config=self.quantization_config
+            )
+        return self._storages[key]
 
 
 class AgentCardStorage:
@@ -426,11 +465,14 @@ class ConversationMemoryStorage:
     def __init__(self,
                  qdrant_client: QdrantClient,
                  collection_name: str = "conversation_history",
-                 embeddings = None):
+                 embeddings = None,
+                 quantization_config = None):
         """Initialize conversation memory storage."""
         self.client = qdrant_client
         self.collection_name = collection_name
         self.embeddings = embeddings
+        self.quantization_config = quantization_config
+        self._search_params = _RESCORED_SEARCH if quantization_config else None
         
         if not self.client.collection_exists(collection_name):
             self.client.create_collection(
@@ -438,8 +480,47 @@ class ConversationMemoryStorage:
                 vectors_config=VectorParams(
                     size=384,  # Default embedding size
                     distance=Distance.COSINE
-                )
+                ),
+                quantization_config=quantization_config
+            )
+        
+        # Searches are almost always scoped to a session; index that payload
+        # field once so the filter is an index lookup rather than a full scan
+        try:
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name="session_id",
+                field_schema=PayloadSchemaType.KEYWORD
             )
+        except Exception as e:
+            print(f"⚠️ Could not index session_id on {collection_name}: {e}")
+    
+    @staticmethod
+    def _make_point(session_id: str,
+                    message: str,
+                    response: str,
+                    timestamp: datetime,
+                    searchable_text: str,
+                    embedding: List[float],
+                    urls: List[str] = None,
+                    metadata: Dict[str, Any] = None) -> PointStruct:
+        """Build the Qdrant point for one conversation exchange."""
+        # Precomputed vectors may arrive as numpy rows
+        if hasattr(embedding, "tolist"):
+            embedding = embedding.tolist()
+        return PointStruct(
+            id=str(uuid.uuid4()),
+            vector=embedding,
+            payload={
+                "session_id": session_id,
+                "message": message,
+                "response": response,
+                "timestamp": timestamp.isoformat(),
+                "urls": urls or [],
+                "metadata": metadata or {},
+                "searchable_text": searchable_text
+            }
+        )
     
     async def store_message(self, 
                           session_id: str,
@@ -447,52 +528,84 @@ class ConversationMemoryStorage:
                           response: str,
                           timestamp: datetime,
                           urls: List[str] = None,
-                          metadata: Dict[str, Any] = None) -> str:
-        """Store conversation message with metadata."""
+                          metadata: Dict[str, Any] = None,
+                          vector: Optional[List[float]] = None) -> str:
+        """
+        Store conversation message with metadata.
+        
+        Pass ``vector`` to reuse an embedding of the searchable text computed
+        ahead of time (e.g. loaded from disk) instead of embedding it here.
+        """
         # Create searchable text combining message and response
         searchable_text = f"User: {message}\nAssistant: {response}"
         
-        # Generate embedding
-        embedding = self.embeddings.embed_query(searchable_text)
-        
-        # Create point with UUID
-        import uuid
-        point_id = str(uuid.uuid4())
-        payload = {
-            "session_id": session_id,
-            "message": message,
-            "response": response,
-            "timestamp": timestamp.isoformat(),
-            "urls": urls or [],
-            "metadata": metadata or {},
-            "searchable_text": searchable_text
-        }
+        # Generate embedding (in a worker thread so concurrent callers overlap)
+        if vector is None:
+            embedding = await asyncio.to_thread(self.embeddings.embed_query, searchable_text)
+        else:
+            embedding = vector
         
-        point = PointStruct(
-            id=point_id,
-            vector=embedding,
-            payload=payload
+        point = self._make_point(
+            session_id, message, response, timestamp,
+            searchable_text, embedding, urls, metadata
         )
         
-        self.client.upsert(
+        await asyncio.to_thread(
+            self.client.upsert,
             collection_name=self.collection_name,
             points=[point]
         )
         
-        return point_id
+        return point.id
     
-    async def search_conversations(self,
-                                 query: str,
-                                 session_id: str = None,
-                                 start_time: datetime = None,
-                                 end_time: datetime = None,
-                                 urls: List[str] = None,
-                                 limit: int = 10) -> List[Dict[str, Any]]:
-        """Search conversation history with filters."""
-        # Generate query embedding
-        query_embedding = self.embeddings.embed_query(query)
+    async def store_messages(self,
+                           session_id: str,
+                           items: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+                           timestamp: datetime,
+                           vectors = None) -> List[str]:
+        """
+        Store several exchanges with one embedding pass and one upsert.
+        
+        Args:
+            session_id: Session the exchanges belong to
+            items: (message, response, metadata) tuples
+            timestamp: Timestamp recorded for every exchange
+            vectors: Optional precomputed embeddings, one row per item
+                (a list of vectors or an (N, D) numpy array); skips embedding
+        
+        Returns:
+            Point IDs in item order
+        """
+        if not items:
+            return []
+        
+        texts = [f"User: {message}\nAssistant: {response}" for message, response, _ in items]
+        if vectors is None:
+            embeddings = await asyncio.to_thread(self.embeddings.embed_documents, texts)
+        else:
+            if len(vectors) != len(items):
+                raise ValueError(f"Expected {len(items)} vectors, got {len(vectors)}")
+            embeddings = vectors
+        
+        points = [
+            self._make_point(session_id, message, response, timestamp, text, embedding, None, metadata)
+            for (message, response, metadata), text, embedding in zip(items, texts, embeddings)
+        ]
+        
+        await asyncio.to_thread(
+            self.client.upsert,
+            collection_name=self.collection_name,
+            points=points
+        )
         
-        # Build filters
+        return [point.id for point in points]
+    
+    def _build_filter(self,
+                      session_id: str = None,
+                      start_time: datetime = None,
+                      end_time: datetime = None,
+                      urls: List[str] = None) -> Optional[Filter]:
+        """Build the Qdrant filter shared by single and batched searches."""
         filters = []
         if session_id:
             filters.append(FieldCondition(key="session_id", match=MatchValue(value=session_id)))
@@ -504,28 +617,81 @@ class ConversationMemoryStorage:
             for url in urls:
                 filters.append(FieldCondition(key="urls", match=MatchValue(value=url)))
         
-        search_filter = Filter(must=filters) if filters else None
+        return Filter(must=filters) if filters else None
+    
+    @staticmethod
+    def _to_result(point) -> Dict[str, Any]:
+        """Convert a scored Qdrant point into a conversation search result."""
+        return {
+            "id": point.id,
+            "score": point.score,
+            "message": point.payload["message"],
+            "response": point.payload["response"],
+            "timestamp": point.payload["timestamp"],
+            "urls": point.payload["urls"],
+            "metadata": point.payload["metadata"]
+        }
+    
+    async def search_conversations(self,
+                                 query: str,
+                                 session_id: str = None,
+                                 start_time: datetime = None,
+                                 end_time: datetime = None,
+                                 urls: List[str] = None,
+                                 limit: int = 10) -> List[Dict[str, Any]]:
+        """Search conversation history with filters."""
+        # Generate query embedding
+        query_embedding = await asyncio.to_thread(self.embeddings.embed_query, query)
+        
+        search_filter = self._build_filter(session_id, start_time, end_time, urls)
         
-        results = self.client.search(
+        results = await asyncio.to_thread(
+            self.client.search,
             collection_name=self.collection_name,
             query_vector=query_embedding,
             query_filter=search_filter,
+            search_params=self._search_params,
             limit=limit,
             with_payload=True
         )
         
-        return [
-            {
-                "id": result.id,
-                "score": result.score,
-                "message": result.payload["message"],
-                "response": result.payload["response"],
-                "timestamp": result.payload["timestamp"],
-                "urls": result.payload["urls"],
-                "metadata": result.payload["metadata"]
-            }
-            for result in results
+        return [self._to_result(result) for result in results]
+    
+    async def search_conversations_batch(self,
+                                       queries: List[str],
+                                       session_id: str = None,
+                                       start_time: datetime = None,
+                                       end_time: datetime = None,
+                                       urls: List[str] = None,
+                                       limit: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Search conversation history for several queries in one request.
+        
+        All queries are embedded in a single encoder pass and sent as one
+        query_batch_points call sharing the same filter.
+        
+        Returns:
+            One result list per query, in query order
+        """
+        if not queries:
+            return []
+        
+        query_embeddings = await asyncio.to_thread(self.embeddings.embed_documents, list(queries))
+        
+        search_filter = self._build_filter(session_id, start_time, end_time, urls)
+        requests = [
+            QueryRequest(query=embedding, filter=search_filter, params=self._search_params,
+                         limit=limit, with_payload=True)
+            for embedding in query_embeddings
         ]
+        
+        responses = await asyncio.to_thread(
+            self.client.query_batch_points,
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        
+        return [[self._to_result(point) for point in response.points] for response in responses]
 
 
 class RAGDocumentStorage:
@@ -536,11 +702,14 @@ class RAGDocumentStorage:
     def __init__(self,
                  qdrant_client: QdrantClient,
                  collection_name: str,
-                 embeddings = None):
+                 embeddings = None,
+                 quantization_config = None):
         """Initialize RAG document storage."""
         self.client = qdrant_client
         self.collection_name = collection_name
         self.embeddings = embeddings
+        self.quantization_config = quantization_config
+        self._search_params = _RESCORED_SEARCH if quantization_config else None
         
         if not self.client.collection_exists(collection_name):
             self.client.create_collection(
@@ -548,36 +717,45 @@ class RAGDocumentStorage:
                 vectors_config=VectorParams(
                     size=384,  # Default embedding size
                     distance=Distance.COSINE
-                )
+                ),
+                quantization_config=quantization_config
             )
     
-    async def store_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+    async def store_documents(self,
+                              documents: List[Dict[str, Any]],
+                              batch_size: int = 32) -> List[str]:
         """Store documents with metadata."""
-        points = []
+        if not documents:
+            return []
         
-        for i, doc in enumerate(documents):
-            content = doc.get("content", "")
-            metadata = doc.get("metadata", {})
-            
-            # Generate embedding
-            embedding = self.embeddings.embed_query(content)
-            
-            point_id = f"{self.collection_name}_{i}_{datetime.now().timestamp()}"
-            point = PointStruct(
-                id=point_id,
+        contents = [doc.get("content", "") for doc in documents]
+        
+        # One batched encoder pass for every document instead of one per document
+        embeddings = await asyncio.to_thread(self.embeddings.embed_documents, contents)
+        
+        now = datetime.now()
+        stamp = now.timestamp()
+        timestamp = now.isoformat()
+        points = [
+            PointStruct(
+                id=f"{self.collection_name}_{i}_{stamp}",
                 vector=embedding,
                 payload={
                     "content": content,
-                    "metadata": metadata,
-                    "timestamp": datetime.now().isoformat()
+                    "metadata": doc.get("metadata", {}),
+                    "timestamp": timestamp
                 }
             )
-            points.append(point)
+            for i, (doc, content, embedding) in enumerate(zip(documents, contents, embeddings))
+        ]
         
-        self.client.upsert(
-            collection_name=self.collection_name,
-            points=points
-        )
+        # Upsert in fixed-size batches to bound request size
+        for start in range(0, len(points), batch_size):
+            await asyncio.to_thread(
+                self.client.upsert,
+                collection_name=self.collection_name,
+                points=points[start:start + batch_size]
+            )
         
         return [p.id for p in points]
     
@@ -586,7 +764,7 @@ class RAGDocumentStorage:
                              filters: Dict[str, Any] = None,
                              limit: int = 10) -> List[Dict[str, Any]]:
         """Search documents with optional filters."""
-        query_embedding = self.embeddings.embed_query(query)
+        query_embedding = await asyncio.to_thread(self.embeddings.embed_query, query)
         
         # Build filters if provided
         search_filter = None
@@ -596,10 +774,12 @@ class RAGDocumentStorage:
                 filter_conditions.append(FieldCondition(key=f"metadata.{key}", match=MatchValue(value=value)))
             search_filter = Filter(must=filter_conditions)
         
-        results = self.client.search(
+        results = await asyncio.to_thread(
+            self.client.search,
             collection_name=self.collection_name,
             query_vector=query_embedding,
             query_filter=search_filter,
+            search_params=self._search_params,
             limit=limit,
             with_payload=True
         )
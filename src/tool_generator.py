@@ -19,12 +19,24 @@ Usage:
     # Tool is automatically added to toolbox and ready to use
 """
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional, Callable, List, Dict, Any
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from src.toolbox import ToolboxManager, get_toolbox
 
 
+# First markdown code fence in an LLM response (an unterminated fence runs to the end)
+_CODE_FENCE_RE = re.compile(r"```(?:python)?(.*?)(?:```|\Z)", re.DOTALL)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return the body of the first code fence in text, or text unchanged if there is none."""
+    match = _CODE_FENCE_RE.search(text)
+    return match.group(1).strip() if match else text
+
+
 class ToolGenerator:
     """
     Generate tools using LLM assistance.
@@ -143,32 +155,35 @@ Start with imports, then the @tool decorated function."""
             generated_code = response.content.strip()
             
             # Clean up code (remove markdown if present)
-            if "```python" in generated_code:
-                generated_code = generated_code.split("```python")[1].split("```")[0].strip()
-            elif "```" in generated_code:
-                generated_code = generated_code.split("```")[1].split("```")[0].strip()
+            generated_code = _strip_code_fence(generated_code)
             
             # Return just code if requested
             if return_code_only:
                 return True, "Tool code generated", generated_code
             
             # Add to toolbox
-            success, message, tool_func = self.toolbox.add_tool_from_code(
-                generated_code,
-                category=category,
-                author="llm",
-                version="1.0.0",
-                tags=["generated", "llm", category]
-            )
-            
-            if success:
-                return True, f"Tool generated and added: {message}", tool_func
-            else:
-                return False, f"Tool generated but failed to add: {message}\n\nGenerated code:\n{generated_code}", generated_code
+            return self._add_generated_code(generated_code, category)
         
         except Exception as e:
             return False, f"Error generating tool: {str(e)}", None
     
+    def _add_generated_code(self,
+                            generated_code: str,
+                            category: str) -> Tuple[bool, str, Optional[Callable]]:
+        """Add LLM-generated tool code to the toolbox."""
+        success, message, tool_func = self.toolbox.add_tool_from_code(
+            generated_code,
+            category=category,
+            author="llm",
+            version="1.0.0",
+            tags=["generated", "llm", category]
+        )
+        
+        if success:
+            return True, f"Tool generated and added: {message}", tool_func
+        else:
+            return False, f"Tool generated but failed to add: {message}\n\nGenerated code:\n{generated_code}", generated_code
+    
     def improve_tool(self,
                     tool_name: str,
                     improvements: str) -> Tuple[bool, str, Optional[Callable]]:
@@ -218,10 +233,7 @@ Generate the improved version with the same function name. Maintain backward com
             improved_code = response.content.strip()
             
             # Clean up code
-            if "```python" in improved_code:
-                improved_code = improved_code.split("```python")[1].split("```")[0].strip()
-            elif "```" in improved_code:
-                improved_code = improved_code.split("```")[1].split("```")[0].strip()
+            improved_code = _strip_code_fence(improved_code)
             
             # Add improved version (will overwrite with force=True)
             success, message, tool_func = self.toolbox.add_tool_from_code(
@@ -328,15 +340,20 @@ class ToolAssistant:
     Integrates with agents to provide tool creation during conversations.
     """
     
-    def __init__(self, toolbox: ToolboxManager = None):
+    def __init__(self, toolbox: ToolboxManager = None, generator: ToolGenerator = None):
         """
         Initialize tool assistant.
         
         Args:
             toolbox: ToolboxManager instance
+            generator: ToolGenerator to reuse (a new one is created if not provided)
         """
         self.toolbox = toolbox or get_toolbox()
-        self.generator = ToolGenerator(toolbox=self.toolbox)
+        self.generator = generator or ToolGenerator(toolbox=self.toolbox)
+        
+        # Suggestions by task, valid for one toolbox revision
+        self._suggestions: Dict[str, List[Dict[str, Any]]] = {}
+        self._suggestions_revision = self.toolbox.revision
     
     def suggest_tools_for_task(self, task_description: str) -> List[Dict[str, Any]]:
         """
@@ -348,6 +365,19 @@ class ToolAssistant:
         Returns:
             List of tool suggestions with metadata
         """
+        if self._suggestions_revision != self.toolbox.revision:
+            self._suggestions.clear()
+            self._suggestions_revision = self.toolbox.revision
+        
+        cached = self._suggestions.get(task_description)
+        if cached is None:
+            if len(self._suggestions) >= 256:
+                self._suggestions.clear()
+            cached = self._suggestions[task_description] = self._rank_tools(task_description)
+        return list(cached)
+    
+    def _rank_tools(self, task_description: str) -> List[Dict[str, Any]]:
+        """Score existing tools against a task by keyword overlap."""
         # Search existing tools
         all_tools = self.toolbox.list_tools()
         
@@ -424,11 +454,24 @@ class ToolAssistant:
             'errors': []
         }
         
-        for desc in tool_descriptions:
-            success, message, tool_func = self.generator.generate_tool(
+        if not tool_descriptions:
+            return results
+        
+        # LLM round-trips are independent, so generate the code concurrently;
+        # adding to the toolbox stays sequential since it writes the registry
+        def generate_code(desc):
+            return self.generator.generate_tool(
                 description=desc,
-                category=category
+                category=category,
+                return_code_only=True
             )
+        
+        with ThreadPoolExecutor(max_workers=min(len(tool_descriptions), 8)) as pool:
+            generated = list(pool.map(generate_code, tool_descriptions))
+        
+        for desc, (success, message, code) in zip(tool_descriptions, generated):
+            if success:
+                success, message, tool_func = self.generator._add_generated_code(code, category)
             
             if success:
                 results['success'] += 1
@@ -447,16 +490,37 @@ class ToolAssistant:
         return results
 
 
+# Global instances, created on first use so the LLM client is built once
+_global_generator = None
+_global_assistant = None
+
+
+def get_tool_generator() -> ToolGenerator:
+    """Get the global tool generator instance."""
+    global _global_generator
+    if _global_generator is None:
+        _global_generator = ToolGenerator()
+    return _global_generator
+
+
+def get_tool_assistant() -> ToolAssistant:
+    """Get the global tool assistant instance (shares the global generator)."""
+    global _global_assistant
+    if _global_assistant is None:
+        _global_assistant = ToolAssistant(generator=get_tool_generator())
+    return _global_assistant
+
+
 # Convenience functions
 def generate_tool(description: str, category: str = "generated", **kwargs) -> Tuple[bool, str, Optional[Callable]]:
     """Generate a tool from description using global generator."""
-    generator = ToolGenerator()
+    generator = get_tool_generator()
     return generator.generate_tool(description, category, **kwargs)
 
 
 def create_tools_for_domain(domain: str, num_tools: int = 5) -> List[Callable]:
     """Generate a collection of tools for a domain."""
-    generator = ToolGenerator()
+    generator = get_tool_generator()
     success, message, tools = generator.generate_tool_collection(domain, num_tools)
     return tools if success else []
 
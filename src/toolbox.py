@@ -46,6 +46,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import traceback
 
 from langchain_core.tools import tool, Tool
@@ -226,6 +227,8 @@ class ToolboxManager:
         self.registry_file = self.toolbox_dir / registry_file
         self.registry: Dict[str, ToolMetadata] = {}
         self.tools: Dict[str, Callable] = {}  # name -> function
+        self.revision = 0  # bumped whenever the registry changes
+        self._names_by_hash: Dict[str, str] = {}  # code_hash -> tool name
         
         if auto_load:
             self._load_registry()
@@ -241,11 +244,17 @@ class ToolboxManager:
                         name: ToolMetadata(**meta) 
                         for name, meta in data.items()
                     }
+                    self._names_by_hash = {
+                        meta.code_hash: name
+                        for name, meta in self.registry.items()
+                        if meta.code_hash
+                    }
             except Exception as e:
                 print(f"⚠️  Error loading registry: {e}")
     
     def _save_registry(self):
         """Save tool registry to disk."""
+        self.revision += 1
         try:
             with open(self.registry_file, 'w') as f:
                 data = {
@@ -301,6 +310,15 @@ class ToolboxManager:
         Returns:
             (success, message, tool_function)
         """
+        # Calculate code hash for duplicate detection
+        code_hash = hashlib.sha256(code.encode()).hexdigest()
+        
+        # Identical code is already registered under its own name, so skip
+        # parsing and validating it again
+        existing_name = self._names_by_hash.get(code_hash)
+        if existing_name is not None and not force:
+            return False, f"Tool '{existing_name}' already exists. Use force=True to overwrite.", None
+        
         # Validate code
         is_valid, message, tree = ToolValidator.validate_code(code)
         if not is_valid:
@@ -317,13 +335,9 @@ class ToolboxManager:
         if tool_name in self.registry and not force:
             return False, f"Tool '{tool_name}' already exists. Use force=True to overwrite.", None
         
-        # Calculate code hash for duplicate detection
-        code_hash = hashlib.sha256(code.encode()).hexdigest()
-        
         # Check if identical code exists
-        for existing_name, metadata in self.registry.items():
-            if metadata.code_hash == code_hash and existing_name != tool_name:
-                return False, f"Identical tool already exists as '{existing_name}'", None
+        if existing_name is not None and existing_name != tool_name:
+            return False, f"Identical tool already exists as '{existing_name}'", None
         
         # Create metadata
         metadata = ToolMetadata(
@@ -379,7 +393,11 @@ from langchain_core.tools import tool
                 return False, "Could not extract tool function from code", None
             
             # Update registry
+            previous = self.registry.get(tool_name)
+            if previous is not None:
+                self._names_by_hash.pop(previous.code_hash, None)
             self.registry[tool_name] = metadata
+            self._names_by_hash[code_hash] = tool_name
             self.tools[tool_name] = tool_func
             self._save_registry()
             
@@ -518,6 +536,7 @@ from langchain_core.tools import tool
             
             # Remove from registry and cache
             del self.registry[tool_name]
+            self._names_by_hash.pop(metadata.code_hash, None)
             if tool_name in self.tools:
                 del self.tools[tool_name]
             
@@ -551,7 +570,8 @@ from langchain_core.tools import tool
             'test_results': []
         }
         
-        for i, test_case in enumerate(test_cases):
+        def run_case(numbered_case):
+            i, test_case = numbered_case
             test_input = test_case.get('input', {})
             expected = test_case.get('expected')
             
@@ -565,28 +585,31 @@ from langchain_core.tools import tool
                 # Check result
                 passed = (expected is None) or (str(expected) in str(result))
                 
-                results['test_results'].append({
+                return {
                     'test_number': i + 1,
                     'passed': passed,
                     'input': test_input,
                     'expected': expected,
                     'actual': result
-                })
-                
-                if passed:
-                    results['passed'] += 1
-                else:
-                    results['failed'] += 1
+                }
                     
             except Exception as e:
-                results['test_results'].append({
+                return {
                     'test_number': i + 1,
                     'passed': False,
                     'input': test_input,
                     'expected': expected,
                     'error': str(e)
-                })
-                results['failed'] += 1
+                }
+        
+        # Test cases are independent, so run them concurrently (map keeps order)
+        if test_cases:
+            with ThreadPoolExecutor(max_workers=min(len(test_cases), 8)) as pool:
+                results['test_results'] = list(pool.map(run_case, enumerate(test_cases)))
+        
+        passed = sum(1 for case in results['test_results'] if case['passed'])
+        results['passed'] = passed
+        results['failed'] = len(test_cases) - passed
         
         # Update metadata
         if tool_name in self.registry:
@@ -636,16 +659,25 @@ from langchain_core.tools import tool
         return f"Exported {len(tools_to_export)} tools to {output_path}"
 
 
-# Global toolbox instance
-_global_toolbox = None
+# Shared toolbox instances, one per toolbox directory
+_toolboxes: Dict[str, ToolboxManager] = {}
 
 
-def get_toolbox() -> ToolboxManager:
-    """Get the global toolbox instance."""
-    global _global_toolbox
-    if _global_toolbox is None:
-        _global_toolbox = ToolboxManager()
-    return _global_toolbox
+def get_toolbox(toolbox_dir: str = "toolbox") -> ToolboxManager:
+    """
+    Get the shared toolbox instance for a directory.
+    
+    Constructing a ToolboxManager creates its category directories and
+    re-executes every stored tool, so callers working on the same directory
+    share one instance instead of each paying that scan.
+    
+    Args:
+        toolbox_dir: Directory the toolbox is stored in
+    """
+    toolbox = _toolboxes.get(toolbox_dir)
+    if toolbox is None:
+        toolbox = _toolboxes[toolbox_dir] = ToolboxManager(toolbox_dir=toolbox_dir)
+    return toolbox
 
 
 def create_tool_from_code(code: str, **kwargs) -> Tuple[bool, str, Optional[Callable]]:
@@ -669,7 +701,7 @@ if __name__ == "__main__":
     print("=" * 70)
     
     # Initialize toolbox
-    toolbox = ToolboxManager(toolbox_dir="test_toolbox")
+    toolbox = get_toolbox("test_toolbox")
     
     # Example 1: Add tool from code
     print("\n1️⃣ Adding tool from code...")
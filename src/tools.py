@@ -11,6 +11,7 @@ import random
 import math
 import json
 import re
+import string
 from typing import Any, Dict, List, Union
 
 
@@ -137,6 +138,34 @@ def matrix_operations(operation: str, matrix_a: str, matrix_b: str = None) -> st
 # SCIENCE TOOLS
 # ============================================================================
 
+# Conversion table keyed by lowercased (from_unit, to_unit), built once at import
+_UNIT_CONVERSIONS = {
+    # Temperature
+    ("celsius", "fahrenheit"): lambda x: x * 9/5 + 32,
+    ("fahrenheit", "celsius"): lambda x: (x - 32) * 5/9,
+    ("celsius", "kelvin"): lambda x: x + 273.15,
+    ("kelvin", "celsius"): lambda x: x - 273.15,
+    
+    # Length
+    ("meters", "feet"): lambda x: x * 3.28084,
+    ("feet", "meters"): lambda x: x / 3.28084,
+    ("inches", "centimeters"): lambda x: x * 2.54,
+    ("centimeters", "inches"): lambda x: x / 2.54,
+    ("kilometers", "miles"): lambda x: x * 0.621371,
+    ("miles", "kilometers"): lambda x: x / 0.621371,
+    
+    # Weight
+    ("grams", "ounces"): lambda x: x * 0.035274,
+    ("ounces", "grams"): lambda x: x / 0.035274,
+    ("kilograms", "pounds"): lambda x: x * 2.20462,
+    ("pounds", "kilograms"): lambda x: x / 2.20462,
+}
+
+_AVAILABLE_UNITS = sorted({unit for pair in _UNIT_CONVERSIONS for unit in pair})
+
+# Lowercases ASCII and drops stray whitespace from unit names in a single pass
+_UNIT_KEY_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, " \t")
+
 @tool
 def unit_converter(value: float, from_unit: str, to_unit: str) -> str:
     """
@@ -148,35 +177,21 @@ def unit_converter(value: float, from_unit: str, to_unit: str) -> str:
     - Weight: grams, kilograms, pounds, ounces
     - Energy: joules, calories, BTU
     """
-    conversions = {
-        # Temperature
-        ("celsius", "fahrenheit"): lambda x: x * 9/5 + 32,
-        ("fahrenheit", "celsius"): lambda x: (x - 32) * 5/9,
-        ("celsius", "kelvin"): lambda x: x + 273.15,
-        ("kelvin", "celsius"): lambda x: x - 273.15,
-        
-        # Length
-        ("meters", "feet"): lambda x: x * 3.28084,
-        ("feet", "meters"): lambda x: x / 3.28084,
-        ("inches", "centimeters"): lambda x: x * 2.54,
-        ("centimeters", "inches"): lambda x: x / 2.54,
-        ("kilometers", "miles"): lambda x: x * 0.621371,
-        ("miles", "kilometers"): lambda x: x / 0.621371,
-        
-        # Weight
-        ("grams", "ounces"): lambda x: x * 0.035274,
-        ("ounces", "grams"): lambda x: x / 0.035274,
-        ("kilograms", "pounds"): lambda x: x * 2.20462,
-        ("pounds", "kilograms"): lambda x: x / 2.20462,
-    }
-    
-    key = (from_unit.lower(), to_unit.lower())
-    if key in conversions:
-        result = conversions[key](value)
+    key = (from_unit.translate(_UNIT_KEY_TABLE), to_unit.translate(_UNIT_KEY_TABLE))
+    convert = _UNIT_CONVERSIONS.get(key)
+    if convert is not None:
+        result = convert(value)
         return f"{value} {from_unit} = {result:.6g} {to_unit}"
     else:
-        available = list(set([unit for pair in conversions.keys() for unit in pair]))
-        return f"Conversion from {from_unit} to {to_unit} not supported. Available units: {available}"
+        return f"Conversion from {from_unit} to {to_unit} not supported. Available units: {_AVAILABLE_UNITS}"
+
+# Basic atomic masses (simplified)
+_ATOMIC_MASSES = {
+    'H': 1.008, 'He': 4.003, 'Li': 6.941, 'Be': 9.012, 'B': 10.811,
+    'C': 12.011, 'N': 14.007, 'O': 15.999, 'F': 18.998, 'Ne': 20.180,
+    'Na': 22.990, 'Mg': 24.305, 'Al': 26.982, 'Si': 28.086, 'P': 30.974,
+    'S': 32.065, 'Cl': 35.453, 'Ar': 39.948, 'K': 39.098, 'Ca': 40.078
+}
 
 @tool
 def chemistry_helper(formula: str, operation: str = "molar_mass") -> str:
@@ -189,14 +204,6 @@ def chemistry_helper(formula: str, operation: str = "molar_mass") -> str:
     
     Example: chemistry_helper("H2O", "molar_mass")
     """
-    # Basic atomic masses (simplified)
-    atomic_masses = {
-        'H': 1.008, 'He': 4.003, 'Li': 6.941, 'Be': 9.012, 'B': 10.811,
-        'C': 12.011, 'N': 14.007, 'O': 15.999, 'F': 18.998, 'Ne': 20.180,
-        'Na': 22.990, 'Mg': 24.305, 'Al': 26.982, 'Si': 28.086, 'P': 30.974,
-        'S': 32.065, 'Cl': 35.453, 'Ar': 39.948, 'K': 39.098, 'Ca': 40.078
-    }
-    
     if operation == "molar_mass":
         try:
             # Parse chemical formula (basic parser)
@@ -220,10 +227,10 @@ def chemistry_helper(formula: str, operation: str = "molar_mass") -> str:
                     
                     count = int(count_str) if count_str else 1
                     
-                    if element in atomic_masses:
-                        total_mass += atomic_masses[element] * count
-                    else:
+                    mass = _ATOMIC_MASSES.get(element)
+                    if mass is None:
                         return f"Unknown element: {element}"
+                    total_mass += mass * count
                 else:
                     i += 1
             
@@ -386,24 +393,30 @@ def json_formatter(json_string: str, operation: str = "format") -> str:
 # TOOL COLLECTIONS
 # ============================================================================
 
+# Collections are fixed at import time; the getters hand out fresh lists so
+# callers can extend them without touching the shared tuples.
+_BASIC_TOOLS = (get_weather, magic_calculator)
+_MATH_TOOLS = (advanced_calculator, solve_quadratic, matrix_operations)
+_SCIENCE_TOOLS = (unit_converter, chemistry_helper, physics_calculator)
+_CODING_TOOLS = (code_analyzer, regex_helper, json_formatter)
+_ALL_TOOLS = _BASIC_TOOLS + _MATH_TOOLS + _SCIENCE_TOOLS + _CODING_TOOLS
+
 def get_basic_tools():
     """Get basic utility tools."""
-    return [get_weather, magic_calculator]
+    return list(_BASIC_TOOLS)
 
 def get_math_tools():
     """Get mathematics-focused tools."""
-    return [advanced_calculator, solve_quadratic, matrix_operations]
+    return list(_MATH_TOOLS)
 
 def get_science_tools():
     """Get science-focused tools."""
-    return [unit_converter, chemistry_helper, physics_calculator]
+    return list(_SCIENCE_TOOLS)
 
 def get_coding_tools():
     """Get programming-focused tools."""
-    return [code_analyzer, regex_helper, json_formatter]
+    return list(_CODING_TOOLS)
 
 def get_all_tools():
     """Get all available tools."""
-    return (get_basic_tools() + get_math_tools() + 
-            get_science_tools() + get_coding_tools())
-
+    return list(_ALL_TOOLS)
@@ -0,0 +1,77 @@
+"""
+Test Agent.chat Replies From Non-Streaming Models
+==================================================
+
+Agent.chat assembles its reply from streamed tokens. Models that return a
+whole message instead (LLM cache hits, non-streaming models) must still
+produce the full reply. Runs offline with fake chat models.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import (
+    FakeMessagesListChatModel,
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+
+from src.base import Agent
+
+
+class CachedFakeChatModel(GenericFakeChatModel):
+    """Token-streaming fake model; tools are accepted and ignored."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class WholeMessageFakeChatModel(FakeMessagesListChatModel):
+    """Fake model that only returns complete messages."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _agent_with_model(model) -> Agent:
+    agent = Agent()
+    agent.model = model
+    agent._dirty = True
+    return agent
+
+
+def test_chat_reply_on_cache_hit():
+    """A second, cached answer is returned in full, not as ""."""
+    model = CachedFakeChatModel(
+        messages=iter([AIMessage(content="The answer is 4")]),
+        cache=InMemoryCache(),
+    )
+    agent = _agent_with_model(model)
+
+    first = agent.chat("What's 2 + 2?")
+    second = agent.chat("What's 2 + 2?")
+
+    assert first == "The answer is 4"
+    assert second == first
+
+
+def test_chat_reply_from_whole_message_model():
+    """A model that never streams tokens still produces a reply."""
+    model = WholeMessageFakeChatModel(responses=[AIMessage(content="Hello there")])
+    agent = _agent_with_model(model)
+
+    assert agent.chat("Hi") == "Hello there"
+
+    model.i = 0
+    assert "".join(agent.stream_chat("Hi")) == "Hello there"
+
+
+if __name__ == "__main__":
+    test_chat_reply_on_cache_hit()
+    test_chat_reply_from_whole_message_model()
+    print("✅ Chat reply tests passed!")